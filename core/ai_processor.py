@@ -5,46 +5,235 @@ Handles content processing, enhancement, and intelligent response generation
 """
 
 import asyncio
+import bisect
+import heapq
+import itertools
 import logging
 import random
+import re
 import os
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+import time
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
 import hashlib
 import json
 
 import aiohttp
-from groq import Groq
+import httpx
+from groq import AsyncGroq
 import tiktoken
 
 from core.config_manager import ConfigManager
+from core.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Keywords marking content as tech-related in fallback analysis (substring match)
+_TECH_KEYWORD_RE = re.compile(
+    "|".join(map(re.escape, [
+        "ai", "artificial intelligence", "machine learning", "technology", "tech", "innovation"
+    ])),
+    re.IGNORECASE
+)
+
+
+# Placeholder API keys shipped in the sample configuration
+_PLACEHOLDER_KEY_RE = re.compile(r'YOUR_GROQ_KEY|your_api_key|placeholder', re.IGNORECASE)
+
+# Sentence end followed by whitespace, allowing a closing quote or bracket
+_SENTENCE_END_RE = re.compile(r'[.!?]["\')\]]?\s')
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Token budget for content quoted in analysis prompts (~1000 characters of English)
+_ANALYSIS_CONTENT_TOKENS = 250
+
+# Completion token ceiling for a batched request
+_BATCH_MAX_TOKENS = 8192
+
+
+# Prompt templates, filled with str.format_map
+_ENHANCE_PROMPT = """Enhance this news content to make it more engaging and professional while maintaining accuracy.
+Make it more lively and appealing for social media sharing.
+
+Topic: {topic}
+Original Content: {content}
+
+Requirements:
+- Keep all factual information accurate
+- Make it more engaging and conversational
+- Optimize for social media sharing
+- Keep it concise but informative
+- Maintain professional tone
+"""
+
+_SOCIAL_POST_PROMPT = """Create a {platform} post from this news content.
+
+Requirements:
+- Must be under {char_limit} characters
+- Include relevant hashtags (max 3)
+- Make it engaging and shareable
+- Keep the key information
+- Use appropriate tone for {platform}
+- Topic focus: {topic}
+
+Content: {content}
+"""
+
+_REPLY_PROMPT = """Generate a thoughtful, intelligent reply to this social media post.
+The reply should be engaging, add value, and show expertise in technology.
+
+Original Post: {original_post}
+Context: {context}
+
+Requirements:
+- Be conversational and friendly
+- Add value to the discussion
+- Show technology expertise
+- Keep under 280 characters
+- Avoid generic responses
+"""
+
+_ANALYSIS_PROMPT = """Analyze this content for quality and sentiment. Return JSON format:
+{{
+    "quality_score": 0.0-1.0,
+    "sentiment": "positive|neutral|negative",
+    "engagement_potential": 0.0-1.0,
+    "topics": ["topic1", "topic2"],
+    "is_tech_related": true/false,
+    "content_type": "news|opinion|announcement",
+    "reasons": ["reason1", "reason2"]
+}}
+
+Content: {content}
+"""
+
+_BATCH_PROMPT = """Process the following {count} items independently.
+Return a JSON array of exactly {count} elements, where element N is the complete response to item N:
+a string, or the JSON object itself when the item asks for JSON.
+
+{items}
+"""
+
+_THREAD_PROMPT = """Break this content into a Twitter thread. Each tweet should be under {tweet_limit} characters
+(leaving room for thread numbering). Make natural breaks that maintain context.
+Return as JSON array of strings.
+
+Content: {content}
+"""
+
+
+def _parse_json_response(text: str, opener: str) -> Any:
+    """Decode the JSON value starting at the first opener, ignoring any surrounding prose or code fences"""
+    start = text.find(opener)
+    if start < 0:
+        raise json.JSONDecodeError("No JSON value found", text, 0)
+    value, _ = _JSON_DECODER.raw_decode(text, start)
+    return value
+
+
+def _cut_at_sentence(text: str) -> str:
+    """Drop a trailing partial sentence, unless that would lose most of the text"""
+    end = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        end = match.end()
+    if end >= len(text) // 2:
+        return text[:end].rstrip()
+    return text
+
+
+def _is_valid_key(key: Optional[str]) -> bool:
+    """Check that an API key is present, long enough and not a placeholder"""
+    return bool(key) and len(key.strip()) > 10 and _PLACEHOLDER_KEY_RE.search(key) is None
+
+
+def _content_key(*parts: str) -> bytes:
+    """Compact binary cache key for content (BLAKE2b, 128-bit digest)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(part.encode())
+        hasher.update(b'\x00')  # Separator so ("ab", "c") != ("a", "bc")
+    return hasher.digest()
+
+
+@dataclass(slots=True)
+class KeyStatus:
+    """Usage and health of a single API key"""
+    success_count: int = 0
+    error_count: int = 0
+    last_used: Optional[float] = None  # Wall-clock epoch seconds
+    last_error: Optional[str] = None
+    rate_limited_until: Optional[float] = None  # time.monotonic() deadline
+
 
 class AIKeyRotator:
     """Manages multiple GROQ API keys with intelligent rotation and failover"""
     
     def __init__(self, api_keys: List[str]):
         # Filter out all placeholder keys and empty/invalid keys
-        placeholder_patterns = ["YOUR_GROQ_KEY", "your_api_key", "placeholder"]
-        self.api_keys = [
-            key for key in api_keys 
-            if key and key.strip() and not any(pattern in key for pattern in placeholder_patterns) and len(key) > 10
-        ]
+        self.api_keys = [key for key in api_keys if _is_valid_key(key)]
         self.current_index = 0
-        self.key_status: Dict[str, Dict] = {}
+        self.key_status: Dict[str, KeyStatus] = {}
         self.failed_keys = set()
         
+        # Selectable keys as (usage score, seq, key), kept sorted with bisect;
+        # _ranked_entry holds each ranked key's current entry for removal
+        self._ranked: List[Tuple[int, int, str]] = []
+        self._ranked_entry: Dict[str, Tuple[int, int, str]] = {}
+        
+        # Rate-limited keys by expiry (lazy deletion: an entry is live only
+        # while its sequence number matches the key's latest one in _heap_seq)
+        self._rate_limit_heap: List[Tuple[float, int, str]] = []
+        self._heap_seq: Dict[str, int] = {}
+        self._seq = itertools.count()
+        
+        # Cached status report, rebuilt only after key state changes
+        self._report_cache: Optional[Dict[str, Any]] = None
+        self._report_rate_limited: List[Tuple[Dict[str, Any], float]] = []
+        self._report_dirty = True
+        
+        # One async client per key, all sharing a pooled HTTP connection
+        self._clients: Dict[str, AsyncGroq] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        
         # Initialize key status tracking
         for key in self.api_keys:
-            self.key_status[key] = {
-                'success_count': 0,
-                'error_count': 0,
-                'last_used': None,
-                'last_error': None,
-                'rate_limited_until': None
-            }
+            self.key_status[key] = KeyStatus()
+            self._push_key(key)
+    
+    def _usage_score(self, key: str) -> int:
+        """Usage score for rotation (lower is preferred)"""
+        status = self.key_status[key]
+        return status.success_count - (status.error_count * 2)
+    
+    def _push_key(self, key: str) -> None:
+        """(Re)insert key into the ranked list at its current score"""
+        seq = next(self._seq)
+        self._heap_seq[key] = seq
+        self._unrank_key(key)
+        entry = (self._usage_score(key), seq, key)
+        bisect.insort(self._ranked, entry)
+        self._ranked_entry[key] = entry
+    
+    def _unrank_key(self, key: str) -> None:
+        """Remove the key's entry from the ranked list, if any"""
+        entry = self._ranked_entry.pop(key, None)
+        if entry is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, entry)]
+    
+    def _retire_key(self, key: str) -> None:
+        """Take the key out of rotation and invalidate its pending heap entries"""
+        self._heap_seq[key] = next(self._seq)
+        self._unrank_key(key)
+    
+    def _release_rate_limited(self, current_time: float) -> None:
+        """Move keys whose rate limit expired back into rotation"""
+        while self._rate_limit_heap and self._rate_limit_heap[0][0] <= current_time:
+            _, seq, key = heapq.heappop(self._rate_limit_heap)
+            if self._heap_seq.get(key) == seq and key not in self.failed_keys:
+                self._push_key(key)
     
     def get_next_key(self) -> Optional[str]:
         """Get next available API key using smart rotation"""
@@ -52,93 +241,181 @@ class AIKeyRotator:
             logger.error("No valid API keys available")
             return None
         
-        # Filter out rate-limited keys
-        available_keys = []
-        current_time = datetime.now()
+        self._release_rate_limited(time.monotonic())
         
-        for key in self.api_keys:
-            if key in self.failed_keys:
-                continue
-                
-            status = self.key_status[key]
-            rate_limit_until = status.get('rate_limited_until')
-            
-            if rate_limit_until and current_time < rate_limit_until:
-                continue  # Still rate limited
-                
-            available_keys.append(key)
+        # Three least used keys straight from the ranked list
+        top_entries = self._ranked[:3]
         
-        if not available_keys:
+        if not top_entries:
             # If all keys are rate limited, use the one with earliest expiry
             logger.warning("All keys rate limited, using earliest available")
-            earliest_key = min(
-                self.api_keys,
-                key=lambda k: self.key_status[k].get('rate_limited_until', datetime.min)
-            )
-            return earliest_key
-        
-        # Use round-robin with preference for less-used keys
-        key_usage_scores = []
-        for key in available_keys:
-            status = self.key_status[key]
-            usage_score = status['success_count'] - (status['error_count'] * 2)
-            key_usage_scores.append((key, usage_score))
-        
-        # Sort by usage score (lower is better for rotation)
-        key_usage_scores.sort(key=lambda x: x[1])
+            while self._rate_limit_heap:
+                _, seq, key = self._rate_limit_heap[0]
+                if self._heap_seq.get(key) == seq:
+                    return key
+                heapq.heappop(self._rate_limit_heap)
+            return self.api_keys[0]
         
         # Use the least used key with some randomization
-        top_keys = key_usage_scores[:min(3, len(key_usage_scores))]
-        selected_key = random.choice(top_keys)[0]
+        selected_key = random.choice(top_entries)[2]
         
         return selected_key
     
     def record_success(self, api_key: str):
         """Record successful API call"""
         if api_key in self.key_status:
-            self.key_status[api_key]['success_count'] += 1
-            self.key_status[api_key]['last_used'] = datetime.now()
+            self._report_dirty = True
+            status = self.key_status[api_key]
+            status.success_count += 1
+            status.last_used = time.time()
             self.failed_keys.discard(api_key)  # Remove from failed keys
+            
+            rate_limit_until = status.rate_limited_until
+            if not rate_limit_until or time.monotonic() >= rate_limit_until:
+                self._push_key(api_key)
     
     def record_error(self, api_key: str, error_type: str, error_message: str):
         """Record API error and handle rate limiting"""
         if api_key not in self.key_status:
             return
             
-        self.key_status[api_key]['error_count'] += 1
-        self.key_status[api_key]['last_error'] = error_message
+        self._report_dirty = True
+        status = self.key_status[api_key]
+        status.error_count += 1
+        status.last_error = error_message
         
         # Handle rate limiting
-        if "rate limit" in error_message.lower() or error_type == "rate_limit":
+        message_lower = error_message.lower()
+        if "rate limit" in message_lower or error_type == "rate_limit":
             # Rate limited for 1 hour
-            self.key_status[api_key]['rate_limited_until'] = datetime.now() + timedelta(hours=1)
+            rate_limit_until = time.monotonic() + 3600
+            status.rate_limited_until = rate_limit_until
+            self._retire_key(api_key)
+            heapq.heappush(self._rate_limit_heap, (rate_limit_until, self._heap_seq[api_key], api_key))
             logger.warning(f"API key rate limited: {api_key[:8]}...")
             
-        elif "invalid" in error_message.lower() or error_type == "auth_error":
+        elif "invalid" in message_lower or error_type == "auth_error":
             # Invalid key - mark as failed
             self.failed_keys.add(api_key)
+            self._retire_key(api_key)
             logger.error(f"API key marked as failed: {api_key[:8]}...")
+            
+        elif api_key not in self.failed_keys:
+            # Re-rank with the updated error count
+            rate_limit_until = status.rate_limited_until
+            if not rate_limit_until or time.monotonic() >= rate_limit_until:
+                self._push_key(api_key)
+    
+    def get_client(self, api_key: str) -> AsyncGroq:
+        """Get the cached async GROQ client for an API key"""
+        client = self._clients.get(api_key)
+        if client is None:
+            if self._http_client is None:
+                self._http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+                )
+            client = AsyncGroq(api_key=api_key, http_client=self._http_client)
+            self._clients[api_key] = client
+        return client
+    
+    async def close(self):
+        """Close pooled API connections"""
+        self._clients.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
     
     def get_status_report(self) -> Dict[str, Any]:
         """Get status report of all API keys"""
+        if self._report_dirty or self._report_cache is None:
+            self._build_status_report()
+        
+        # Only the time-dependent flag is refreshed between mutations
+        current_time = time.monotonic()
+        for details, rate_limit_until in self._report_rate_limited:
+            details['is_rate_limited'] = current_time < rate_limit_until
+        
+        # Copies down to the per-key dicts, so callers can't corrupt the cache
+        report = self._report_cache
         return {
+            **report,
+            'key_details': {key: dict(details) for key, details in report['key_details'].items()}
+        }
+    
+    def _build_status_report(self) -> None:
+        """Rebuild the cached status report skeleton"""
+        key_details = {}
+        self._report_rate_limited = []
+        
+        for key, status in self.key_status.items():
+            details = {
+                'success_count': status.success_count,
+                'error_count': status.error_count,
+                'last_used': datetime.fromtimestamp(status.last_used).isoformat() if status.last_used else None,
+                'is_rate_limited': False,
+                'is_failed': key in self.failed_keys
+            }
+            if status.rate_limited_until:
+                self._report_rate_limited.append((details, status.rate_limited_until))
+            key_details[key[:8] + "..."] = details
+        
+        self._report_cache = {
             'total_keys': len(self.api_keys),
             'active_keys': len(self.api_keys) - len(self.failed_keys),
             'failed_keys': len(self.failed_keys),
-            'key_details': {
-                key[:8] + "...": {
-                    'success_count': status['success_count'],
-                    'error_count': status['error_count'],
-                    'last_used': status['last_used'].isoformat() if status['last_used'] else None,
-                    'is_rate_limited': (
-                        status.get('rate_limited_until') and 
-                        datetime.now() < status['rate_limited_until']
-                    ),
-                    'is_failed': key in self.failed_keys
-                }
-                for key, status in self.key_status.items()
-            }
+            'key_details': key_details
         }
+        self._report_dirty = False
+
+
+class PromptBatcher:
+    """Coalesces prompts submitted within a short window into one batched AI call"""
+    
+    def __init__(self, process_batch: Callable[[List[str]], Awaitable[List[Optional[str]]]],
+                 window: float = 0.05, max_batch_size: int = 8):
+        self.process_batch = process_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+    
+    async def submit(self, prompt: str) -> Optional[str]:
+        """Queue a prompt and wait for its result from the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Send all pending prompts as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Process a batch and resolve each submitter's future"""
+        try:
+            results = await self.process_batch([prompt for prompt, _ in batch])
+        except Exception as e:
+            logger.error(f"Batched AI processing error: {e}")
+            results = [None] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
 
 
 class AIProcessor:
@@ -159,9 +436,31 @@ class AIProcessor:
         self.max_tokens = self.ai_config.get('max_tokens', 1000)
         self.temperature = self.ai_config.get('temperature', 0.7)
         
-        # Content cache for processing optimization
-        self.content_cache: Dict[str, Any] = {}
+        # Constant parts of every completion request, built once
+        self._system_msg = {
+            "role": "system",
+            "content": "You are a helpful AI assistant specialized in content creation and social media."
+        }
+        self._common_kwargs = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+        
+        # Content cache for processing optimization, keyed by (operation, content_key)
         self.cache_ttl = 3600  # 1 hour
+        self.content_cache = TTLCache(
+            maxsize=self.ai_config.get('cache_size', 10000),
+            ttl=self.cache_ttl
+        )
+        
+        # In-flight AI requests, shared by concurrent callers with the same key
+        self._inflight: Dict[Tuple[str, bytes], asyncio.Future] = {}
+        
+        # Prompts arriving in a burst share one batched call per operation
+        self._enhance_batcher = self._create_batcher("content_enhancement")
+        self._analysis_batcher = self._create_batcher("content_analysis", stream_json='{')
+        self._social_post_batcher = self._create_batcher("social_post")
         
         # Initialize tokenizer for content management
         try:
@@ -169,6 +468,24 @@ class AIProcessor:
         except Exception as e:
             logger.warning(f"Could not initialize tokenizer: {e}")
             self.tokenizer = None
+        
+        # Opt-in cap on article tokens in enhancement, post and thread prompts;
+        # unset sends the full content
+        self.max_prompt_tokens: Optional[int] = self.ai_config.get('max_prompt_tokens')
+        
+        # Token IDs per content, so content reused across prompts is tokenized once
+        self.token_cache = TTLCache(
+            maxsize=self.ai_config.get('cache_size', 10000),
+            ttl=self.cache_ttl
+        )
+    
+    def _create_batcher(self, operation_type: str, stream_json: Optional[str] = None) -> PromptBatcher:
+        """Create a prompt batcher that packs one operation's prompts into a single call"""
+        return PromptBatcher(
+            lambda prompts: self.process_many(prompts, operation_type, stream_json),
+            window=self.ai_config.get('batch_window_ms', 50) / 1000,
+            max_batch_size=self.ai_config.get('max_batch_size', 8)
+        )
     
     def _load_api_keys(self) -> List[str]:
         """Load and validate GROQ API keys from environment and config"""
@@ -176,23 +493,15 @@ class AIProcessor:
         
         # First try environment variable
         env_key = os.getenv('GROQ_API_KEY')
-        if env_key and len(env_key.strip()) > 10:  
-            cleaned_key = env_key.strip()
-            # Filter out placeholder patterns
-            placeholder_patterns = ['YOUR_GROQ_KEY', 'your_api_key', 'placeholder']
-            if cleaned_key not in placeholder_patterns:
-                keys.append(cleaned_key)
-                logger.info("✅ GROQ API key loaded from environment")
+        if _is_valid_key(env_key):
+            keys.append(env_key.strip())
+            logger.info("✅ GROQ API key loaded from environment")
         
         # Then try config file keys
         config_keys = self.ai_config.get('primary_keys', [])
         for key in config_keys:
-            if key and len(key.strip()) > 10 and key.strip() not in keys:
-                cleaned_key = key.strip()
-                # Filter out placeholder patterns
-                placeholder_patterns = ['YOUR_GROQ_KEY', 'your_api_key', 'placeholder']
-                if cleaned_key not in placeholder_patterns:
-                    keys.append(cleaned_key)
+            if _is_valid_key(key) and key.strip() not in keys:
+                keys.append(key.strip())
         
         if not keys:
             logger.warning("❌ No valid GROQ API keys found - AI features will be disabled")
@@ -205,24 +514,14 @@ class AIProcessor:
     async def enhance_content(self, original_content: str, topic: str = "") -> Optional[str]:
         """Enhance news content to make it more engaging"""
         try:
-            # Create content hash for caching
-            content_hash = hashlib.md5(original_content.encode()).hexdigest()
-            
-            # Check cache first
-            if self._is_cached(content_hash, 'enhance'):
-                logger.debug("Using cached enhanced content")
-                return self.content_cache[content_hash]['enhanced']
-            
-            # Create enhancement prompt
-            prompt = self._create_enhancement_prompt(original_content, topic)
-            
-            # Process with AI
-            enhanced = await self._process_with_ai(prompt, "content_enhancement")
-            
+            enhanced = await self._cached_ai(
+                ('enhance', _content_key(original_content)), "content_enhancement",
+                lambda: self._create_enhancement_prompt(
+                    self._fit_to_token_budget(original_content, self.max_prompt_tokens), topic
+                ),
+                process=self._enhance_batcher.submit
+            )
             if enhanced:
-                # Cache the result
-                self._cache_result(content_hash, 'enhance', {'enhanced': enhanced})
-                logger.debug("Content enhanced successfully")
                 return enhanced
             
             # Fallback to original content
@@ -235,61 +534,51 @@ class AIProcessor:
     
     async def generate_social_post(self, news_content: str, platform: str, topic: str = "") -> Optional[str]:
         """Generate platform-specific social media post"""
+        social_post, _ = await self.generate_social_post_with_status(news_content, platform, topic)
+        return social_post
+    
+    async def generate_social_post_with_status(self, news_content: str, platform: str,
+                                               topic: str = "") -> Tuple[Optional[str], bool]:
+        """Generate a social post and whether it is final (False for the fallback used when AI fails)"""
         char_limit = 280  # Default limit
         try:
             # Get platform config
             platform_config = self.config.get_twitter_config() if platform == 'twitter' else {}
             char_limit = platform_config.get('limits', {}).get('character_limit', 280)
             
-            # Create content hash for caching
-            cache_key = f"{platform}_{hashlib.md5(news_content.encode()).hexdigest()}"
-            
-            if self._is_cached(cache_key, 'social_post'):
-                logger.debug("Using cached social post")
-                return self.content_cache[cache_key]['post']
-            
-            # Create social media post prompt
-            prompt = self._create_social_post_prompt(news_content, platform, char_limit, topic)
-            
-            # Process with AI
-            social_post = await self._process_with_ai(prompt, "social_post")
-            
+            # Headline-length content already fits with its hashtags, so the
+            # fallback post is final and the AI round-trip can be skipped
+            hashtag_string = " ".join(self.config.get_hashtags_for_topic(topic))
+            projected_len = len(news_content) + len(hashtag_string) + 1
+            if len(news_content) >= 40 and projected_len <= char_limit - 10:
+                logger.debug(f"Short content posted as-is for {platform}")
+                return self._create_fallback_post(news_content, char_limit, topic), True
+            
+            social_post = await self._cached_ai(
+                ('social_post', _content_key(platform, news_content)), "social_post",
+                lambda: self._create_social_post_prompt(
+                    self._fit_to_token_budget(news_content, self.max_prompt_tokens), platform, char_limit, topic
+                ),
+                process=self._social_post_batcher.submit
+            )
             if social_post:
-                # Cache the result
-                self._cache_result(cache_key, 'social_post', {'post': social_post})
-                logger.debug(f"Social post generated for {platform}")
-                return social_post
+                return social_post, True
             
             # Fallback to truncated original
-            return self._create_fallback_post(news_content, char_limit, topic)
+            return self._create_fallback_post(news_content, char_limit, topic), False
             
         except Exception as e:
             logger.error(f"Social post generation error: {e}")
-            return self._create_fallback_post(news_content, char_limit, topic)
+            return self._create_fallback_post(news_content, char_limit, topic), False
     
     async def generate_intelligent_reply(self, original_post: str, context: str = "") -> Optional[str]:
         """Generate intelligent reply to a social media post"""
         try:
-            # Create content hash for caching
-            cache_key = f"reply_{hashlib.md5((original_post + context).encode()).hexdigest()}"
-            
-            if self._is_cached(cache_key, 'reply'):
-                logger.debug("Using cached reply")
-                return self.content_cache[cache_key]['reply']
-            
-            # Create reply prompt
-            prompt = self._create_reply_prompt(original_post, context)
-            
-            # Process with AI
-            reply = await self._process_with_ai(prompt, "intelligent_reply")
-            
-            if reply:
-                # Cache the result
-                self._cache_result(cache_key, 'reply', {'reply': reply})
-                logger.debug("Intelligent reply generated")
-                return reply
-            
-            return None
+            reply = await self._cached_ai(
+                ('reply', _content_key(original_post, context)), "intelligent_reply",
+                lambda: self._create_reply_prompt(original_post, context)
+            )
+            return reply or None
             
         except Exception as e:
             logger.error(f"Reply generation error: {e}")
@@ -298,36 +587,23 @@ class AIProcessor:
     async def analyze_content_quality(self, content: str) -> Dict[str, Any]:
         """Analyze content quality and sentiment"""
         try:
-            # Create analysis prompt
-            prompt = f"""
-            Analyze this content for quality and sentiment. Return JSON format:
-            {{
-                "quality_score": 0.0-1.0,
-                "sentiment": "positive|neutral|negative",
-                "engagement_potential": 0.0-1.0,
-                "topics": ["topic1", "topic2"],
-                "is_tech_related": true/false,
-                "content_type": "news|opinion|announcement",
-                "reasons": ["reason1", "reason2"]
-            }}
-            
-            Content: {content[:1000]}
-            """
-            
-            # Process with AI
-            analysis_result = await self._process_with_ai(prompt, "content_analysis")
-            
-            if analysis_result:
-                try:
-                    # Parse JSON response
-                    analysis = json.loads(analysis_result)
-                    return analysis
-                except json.JSONDecodeError:
-                    logger.error("Failed to parse content analysis JSON")
+            analysis = await self._cached_ai(
+                ('analysis', _content_key(content)), "content_analysis",
+                lambda: _ANALYSIS_PROMPT.format_map({
+                    'content': self._fit_to_token_budget(content, _ANALYSIS_CONTENT_TOKENS)
+                }),
+                parse=lambda result: _parse_json_response(result, '{'),
+                process=self._analysis_batcher.submit
+            )
+            if analysis:
+                return analysis
             
             # Fallback analysis
             return self._create_fallback_analysis(content)
             
+        except json.JSONDecodeError:
+            logger.error("Failed to parse content analysis JSON")
+            return self._create_fallback_analysis(content)
         except Exception as e:
             logger.error(f"Content analysis error: {e}")
             return self._create_fallback_analysis(content)
@@ -340,20 +616,17 @@ class AIProcessor:
             char_limit = platform_config.get('limits', {}).get('character_limit', 280)
             
             # Create threading prompt
-            prompt = f"""
-            Break this content into a Twitter thread. Each tweet should be under {char_limit-20} characters 
-            (leaving room for thread numbering). Make natural breaks that maintain context.
-            Return as JSON array of strings.
-            
-            Content: {long_content}
-            """
+            prompt = _THREAD_PROMPT.format_map({
+                'tweet_limit': char_limit - 20,
+                'content': self._fit_to_token_budget(long_content, self.max_prompt_tokens)
+            })
             
             # Process with AI
-            thread_result = await self._process_with_ai(prompt, "thread_creation")
+            thread_result = await self._process_with_ai(prompt, "thread_creation", stream_json='[')
             
             if thread_result:
                 try:
-                    thread_posts = json.loads(thread_result)
+                    thread_posts = _parse_json_response(thread_result, '[')
                     if isinstance(thread_posts, list):
                         return thread_posts
                 except json.JSONDecodeError:
@@ -366,9 +639,98 @@ class AIProcessor:
             logger.error(f"Thread creation error: {e}")
             return self._create_simple_thread(long_content, char_limit)
     
-    async def _process_with_ai(self, prompt: str, operation_type: str) -> Optional[str]:
-        """Process prompt with AI using key rotation"""
+    async def _cached_ai(self, cache_key: Tuple[str, bytes], operation_type: str,
+                         build_prompt: Callable[[], str],
+                         parse: Optional[Callable[[str], Any]] = None,
+                         stream_json: Optional[str] = None,
+                         process: Optional[Callable[[str], Awaitable[Optional[str]]]] = None) -> Any:
+        """Serve an AI result from cache, or generate, parse and cache it"""
+        cached = self.content_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Using cached {operation_type} result")
+            return cached
+        
+        result = await self._process_single_flight(
+            cache_key, build_prompt(), operation_type, stream_json, process
+        )
+        if not result:
+            return None
+        
+        if parse is not None:
+            result = parse(result)
+        
+        self.content_cache[cache_key] = result
+        logger.debug(f"{operation_type} result generated")
+        return result
+    
+    async def _process_single_flight(self, cache_key: Tuple[str, bytes], prompt: str,
+                                     operation_type: str, stream_json: Optional[str] = None,
+                                     process: Optional[Callable[[str], Awaitable[Optional[str]]]] = None
+                                     ) -> Optional[str]:
+        """Process prompt with AI, coalescing concurrent identical requests"""
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            logger.debug(f"Joining in-flight {operation_type} request")
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        result = None
+        try:
+            if process is not None:
+                result = await process(prompt)
+            else:
+                result = await self._process_with_ai(prompt, operation_type, stream_json)
+            return result
+        finally:
+            # Waiters fall back the same way the caller does on None
+            del self._inflight[cache_key]
+            future.set_result(result)
+    
+    async def process_many(self, prompts: List[str], operation_type: str = "batch",
+                           stream_json: Optional[str] = None) -> List[Optional[str]]:
+        """Process several prompts with a single AI call, returning one result per prompt"""
+        # stream_json applies to prompts answered on their own, as in _process_with_ai
+        if len(prompts) <= 1:
+            return [await self._process_with_ai(prompt, operation_type, stream_json) for prompt in prompts]
+        
+        items = "\n\n".join(f"Item {i}:\n{prompt.strip()}" for i, prompt in enumerate(prompts, 1))
+        packed = _BATCH_PROMPT.format_map({'count': len(prompts), 'items': items})
+        result = await self._process_with_ai(
+            packed, operation_type, stream_json='[',
+            max_tokens=min(self.max_tokens * len(prompts), _BATCH_MAX_TOKENS)
+        )
+        if result is None:
+            return [None] * len(prompts)
+        
+        try:
+            answers = _parse_json_response(result, '[')
+            if (isinstance(answers, list) and len(answers) == len(prompts)
+                    and all(isinstance(answer, (str, dict)) for answer in answers)):
+                logger.debug(f"Batched {len(prompts)} {operation_type} prompts into one call")
+                # JSON answers go back to text so callers parse them as if answered alone
+                return [
+                    answer.strip() if isinstance(answer, str) else json.dumps(answer, ensure_ascii=False)
+                    for answer in answers
+                ]
+        except json.JSONDecodeError:
+            pass
+        
+        # Malformed batch response - answer each prompt on its own
+        logger.warning(f"Batched {operation_type} response malformed, processing items individually")
+        return list(await asyncio.gather(
+            *(self._process_with_ai(prompt, operation_type, stream_json) for prompt in prompts)
+        ))
+    
+    async def _process_with_ai(self, prompt: str, operation_type: str,
+                               stream_json: Optional[str] = None,
+                               max_tokens: Optional[int] = None) -> Optional[str]:
+        """Process prompt with AI using key rotation (streamed when a JSON opener is given)"""
         max_retries = len(self.key_rotator.api_keys)
+        messages = [self._system_msg, {"role": "user", "content": prompt}]
+        request_kwargs = self._common_kwargs
+        if max_tokens is not None:
+            request_kwargs = {**request_kwargs, "max_tokens": max_tokens}
         
         for retry in range(max_retries):
             api_key = self.key_rotator.get_next_key()
@@ -377,24 +739,22 @@ class AIProcessor:
                 return None
             
             try:
-                # Initialize Groq client
-                client = Groq(api_key=api_key)
+                # Reuse the pooled client for this key
+                client = self.key_rotator.get_client(api_key)
                 
-                # Make API call
-                response = client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are a helpful AI assistant specialized in content creation and social media."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature
-                )
+                if stream_json:
+                    result = await self._stream_json_completion(client, messages, stream_json, request_kwargs)
+                else:
+                    # Make API call (non-blocking)
+                    response = await client.chat.completions.create(
+                        messages=messages,
+                        **request_kwargs
+                    )
+                    result = response.choices[0].message.content
                 
                 # Record success
                 self.key_rotator.record_success(api_key)
                 
-                result = response.choices[0].message.content
                 return result.strip() if result else ""
                 
             except Exception as e:
@@ -402,9 +762,10 @@ class AIProcessor:
                 logger.error(f"AI processing error (attempt {retry + 1}): {error_message}")
                 
                 # Record error
-                if "rate limit" in error_message.lower():
+                message_lower = error_message.lower()
+                if "rate limit" in message_lower:
                     self.key_rotator.record_error(api_key, "rate_limit", error_message)
-                elif "invalid" in error_message.lower():
+                elif "invalid" in message_lower:
                     self.key_rotator.record_error(api_key, "auth_error", error_message)
                 else:
                     self.key_rotator.record_error(api_key, "general_error", error_message)
@@ -415,55 +776,79 @@ class AIProcessor:
         logger.error(f"All API keys failed for {operation_type}")
         return None
     
+    async def _stream_json_completion(self, client: AsyncGroq, messages: List[Dict[str, str]],
+                                      opener: str, request_kwargs: Dict[str, Any]) -> str:
+        """Stream a completion and stop reading once the JSON value it contains is complete"""
+        closer = ']' if opener == '[' else '}'
+        stream = await client.chat.completions.create(
+            messages=messages,
+            stream=True,
+            **request_kwargs
+        )
+        
+        parts = []
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                
+                # A value can only complete on a chunk carrying its closer
+                if closer in delta:
+                    text = "".join(parts)
+                    try:
+                        _parse_json_response(text, opener)
+                    except json.JSONDecodeError:
+                        continue
+                    parts = [text]
+                    break
+        finally:
+            # Drops the rest of the generation once the value is complete
+            await stream.close()
+        
+        return "".join(parts)
+    
+    def _fit_to_token_budget(self, content: str, max_tokens: Optional[int]) -> str:
+        """Trim content to at most max_tokens tokens at a sentence boundary, reusing cached token IDs"""
+        if max_tokens is None:
+            return content
+        
+        if self.tokenizer is None:
+            # Roughly four characters per token without a tokenizer
+            if len(content) <= max_tokens * 4:
+                return content
+            return _cut_at_sentence(content[:max_tokens * 4])
+        
+        key = _content_key(content)
+        tokens = self.token_cache.get(key)
+        if tokens is None:
+            # Article text is untrusted; special-token text counts as plain text
+            tokens = array('I', self.tokenizer.encode(content, disallowed_special=()))
+            self.token_cache[key] = tokens
+        
+        if len(tokens) <= max_tokens:
+            return content
+        return _cut_at_sentence(self.tokenizer.decode(tokens[:max_tokens].tolist()))
+    
     def _create_enhancement_prompt(self, content: str, topic: str) -> str:
         """Create prompt for content enhancement"""
-        return f"""
-        Enhance this news content to make it more engaging and professional while maintaining accuracy.
-        Make it more lively and appealing for social media sharing.
-        
-        Topic: {topic}
-        Original Content: {content}
-        
-        Requirements:
-        - Keep all factual information accurate
-        - Make it more engaging and conversational
-        - Optimize for social media sharing
-        - Keep it concise but informative
-        - Maintain professional tone
-        """
+        return _ENHANCE_PROMPT.format_map({'topic': topic, 'content': content})
     
     def _create_social_post_prompt(self, content: str, platform: str, char_limit: int, topic: str) -> str:
         """Create prompt for social media post generation"""
-        return f"""
-        Create a {platform} post from this news content. 
-        
-        Requirements:
-        - Must be under {char_limit} characters
-        - Include relevant hashtags (max 3)
-        - Make it engaging and shareable
-        - Keep the key information
-        - Use appropriate tone for {platform}
-        - Topic focus: {topic}
-        
-        Content: {content}
-        """
+        return _SOCIAL_POST_PROMPT.format_map({
+            'platform': platform,
+            'char_limit': char_limit,
+            'topic': topic,
+            'content': content
+        })
     
     def _create_reply_prompt(self, original_post: str, context: str) -> str:
         """Create prompt for intelligent reply generation"""
-        return f"""
-        Generate a thoughtful, intelligent reply to this social media post. 
-        The reply should be engaging, add value, and show expertise in technology.
-        
-        Original Post: {original_post}
-        Context: {context}
-        
-        Requirements:
-        - Be conversational and friendly
-        - Add value to the discussion
-        - Show technology expertise
-        - Keep under 280 characters
-        - Avoid generic responses
-        """
+        return _REPLY_PROMPT.format_map({'original_post': original_post, 'context': context})
     
     def _create_fallback_post(self, content: str, char_limit: int, topic: str) -> str:
         """Create fallback social media post"""
@@ -483,9 +868,9 @@ class AIProcessor:
     def _create_fallback_analysis(self, content: str) -> Dict[str, Any]:
         """Create fallback content analysis"""
         word_count = len(content.split())
-        tech_keywords = ["ai", "artificial intelligence", "machine learning", "technology", "tech", "innovation"]
         
-        is_tech = any(keyword in content.lower() for keyword in tech_keywords)
+        # Single case-insensitive scan instead of lowering per keyword
+        is_tech = _TECH_KEYWORD_RE.search(content) is not None
         
         return {
             "quality_score": 0.7 if word_count > 50 else 0.5,
@@ -499,44 +884,30 @@ class AIProcessor:
     
     def _create_simple_thread(self, content: str, char_limit: int) -> List[str]:
         """Create simple thread by splitting content"""
-        words = content.split()
+        limit = char_limit - 20
         threads = []
-        current_thread = ""
-        
-        for word in words:
-            if len(current_thread + " " + word) > char_limit - 20:
-                if current_thread:
-                    threads.append(current_thread.strip())
-                current_thread = word
+        current_words: List[str] = []
+        current_length = 0
+        
+        # Track the running length and join each tweet once, instead of
+        # re-concatenating the growing string for every word
+        for word in content.split():
+            if current_words and current_length + 1 + len(word) > limit:
+                threads.append(" ".join(current_words))
+                current_words = [word]
+                current_length = len(word)
+            elif current_words:
+                current_words.append(word)
+                current_length += 1 + len(word)
             else:
-                current_thread += " " + word if current_thread else word
+                current_words = [word]
+                current_length = len(word)
         
-        if current_thread:
-            threads.append(current_thread.strip())
+        if current_words:
+            threads.append(" ".join(current_words))
         
         return threads
     
-    def _is_cached(self, cache_key: str, operation: str) -> bool:
-        """Check if result is cached and valid"""
-        if cache_key not in self.content_cache:
-            return False
-            
-        cached_data = self.content_cache[cache_key]
-        
-        # Check TTL
-        if datetime.now() - cached_data['timestamp'] > timedelta(seconds=self.cache_ttl):
-            del self.content_cache[cache_key]
-            return False
-            
-        return operation in cached_data
-    
-    def _cache_result(self, cache_key: str, operation: str, data: Dict[str, Any]):
-        """Cache operation result"""
-        if cache_key not in self.content_cache:
-            self.content_cache[cache_key] = {'timestamp': datetime.now()}
-        
-        self.content_cache[cache_key].update(data)
-    
     def get_ai_status(self) -> Dict[str, Any]:
         """Get AI system status"""
         return {
@@ -552,7 +923,12 @@ class AIProcessor:
     def clear_cache(self):
         """Clear content cache"""
         self.content_cache.clear()
+        self.token_cache.clear()
         logger.info("Content cache cleared")
+    
+    async def close(self):
+        """Release AI client connections"""
+        await self.key_rotator.close()
 
 
 def create_ai_processor(config_manager: ConfigManager) -> AIProcessor:
@@ -6,163 +6,369 @@ Handles all configuration loading, validation, and dynamic updates
 
 import yaml
 import json
+import mmap
 import os
-from typing import Dict, Any, Optional, List
-from pathlib import Path
+import pickle
+import re
+import struct
+from array import array
+from typing import Dict, Any, Optional, List, Tuple, Mapping
+from types import MappingProxyType
 import logging
-from dataclasses import dataclass, field
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# libyaml C bindings when PyYAML was built with them (needs libyaml-dev at build time)
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# Parsed-config sidecar header: source mtime (ns), source size, cache format
+# version. Bump the version whenever _validate_config rules change.
+_CONFIG_CACHE_VERSION = 3
+_CONFIG_CACHE_HEADER = struct.Struct('<QQQ')
+
+# Configs at least this large are parsed from a read-only memory map
+_MMAP_MIN_CONFIG_SIZE = 64 * 1024
+
+_ENGAGE_ACTIONS = frozenset({'like', 'retweet', 'reply'})
+
+# Placeholder AI keys shipped in the sample configuration
+_PLACEHOLDER_KEY_RE = re.compile(r'YOUR_GROQ_KEY|GROQ_API_KEY|your_api_key')
+# Whole-line match of a valid key, for scanning many newline-joined keys at once
+_VALID_KEY_LINE_RE = re.compile(
+    r'^(?!.*(?:YOUR_GROQ_KEY|GROQ_API_KEY|your_api_key)).{21,}$', re.MULTILINE
+)
+_BATCH_KEY_SCAN_THRESHOLD = 16
+# Template values such as "your_groq_api_key_here" in environment files
+_PLACEHOLDER_PREFIXES = ('your_', 'YOUR_')
+
+_EMPTY_SECTION: Mapping[str, Any] = MappingProxyType({})
+
+# Daily limit settings read from each platform's `limits` section, with defaults
+_PLATFORM_LIMIT_DEFAULTS = {
+    'twitter': {
+        'max_posts_per_day': 50,
+        'max_likes_per_day': 100,
+        'max_retweets_per_day': 30,
+        'max_replies_per_day': 25
+    },
+    'facebook': {'max_posts_per_day': 10},
+    'telegram': {'max_posts_per_day': 100}
+}
+
+_REQUIRED_SECTIONS = frozenset({'ai', 'news_sources', 'twitter', 'facebook', 'telegram', 'content'})
+
+# Topic hashtag buckets, checked in priority order (case-insensitive substring match)
+_TOPIC_BUCKETS = [
+    (re.compile(r'ai|artificial|machine learning', re.IGNORECASE), 'ai_related'),
+    (re.compile(r'blockchain|crypto', re.IGNORECASE), 'blockchain'),
+    (re.compile(r'cloud', re.IGNORECASE), 'cloud'),
+    (re.compile(r'security|cyber', re.IGNORECASE), 'security'),
+]
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Slot of each action in PlatformLimits' packed cap and counter arrays
+_ACTION_INDEX = {'post': 0, 'like': 1, 'retweet': 2, 'reply': 3}
+_POST, _LIKE, _RETWEET, _REPLY = range(4)
+_ZERO_COUNTS = array('q', [0, 0, 0, 0])
+
+
+def _slot_property(buffer: str, index: int) -> property:
+    """Expose one element of a packed array as a named attribute"""
+    return property(
+        lambda self: getattr(self, buffer)[index],
+        lambda self, value: getattr(self, buffer).__setitem__(index, value)
+    )
+
 
-@dataclass
 class PlatformLimits:
     """Platform-specific daily limits"""
-    max_posts_per_day: int
-    max_likes_per_day: int = 0
-    max_retweets_per_day: int = 0
-    max_replies_per_day: int = 0
-    current_posts: int = field(default=0)
-    current_likes: int = field(default=0)
-    current_retweets: int = field(default=0)
-    current_replies: int = field(default=0)
+    __slots__ = ('caps', 'counts')
+    
+    def __init__(self, max_posts_per_day: int, max_likes_per_day: int = 0,
+                 max_retweets_per_day: int = 0, max_replies_per_day: int = 0):
+        # Daily caps and today's counters as packed int64 arrays indexed by action
+        self.caps = array('q', [max_posts_per_day, max_likes_per_day,
+                                max_retweets_per_day, max_replies_per_day])
+        self.counts = array('q', _ZERO_COUNTS)
+    
+    max_posts_per_day = _slot_property('caps', _POST)
+    max_likes_per_day = _slot_property('caps', _LIKE)
+    max_retweets_per_day = _slot_property('caps', _RETWEET)
+    max_replies_per_day = _slot_property('caps', _REPLY)
+    current_posts = _slot_property('counts', _POST)
+    current_likes = _slot_property('counts', _LIKE)
+    current_retweets = _slot_property('counts', _RETWEET)
+    current_replies = _slot_property('counts', _REPLY)
+    
+    def __repr__(self) -> str:
+        return f"PlatformLimits(caps={self.caps.tolist()}, counts={self.counts.tolist()})"
     
     def can_post(self) -> bool:
-        return self.current_posts < self.max_posts_per_day
+        return self.counts[_POST] < self.caps[_POST]
     
     def can_like(self) -> bool:
-        return self.current_likes < self.max_likes_per_day
+        return self.counts[_LIKE] < self.caps[_LIKE]
     
     def can_retweet(self) -> bool:
-        return self.current_retweets < self.max_retweets_per_day
+        return self.counts[_RETWEET] < self.caps[_RETWEET]
     
     def can_reply(self) -> bool:
-        return self.current_replies < self.max_replies_per_day
+        return self.counts[_REPLY] < self.caps[_REPLY]
     
     def increment_posts(self):
-        self.current_posts += 1
+        self.counts[_POST] += 1
         
     def increment_likes(self):
-        self.current_likes += 1
+        self.counts[_LIKE] += 1
         
     def increment_retweets(self):
-        self.current_retweets += 1
+        self.counts[_RETWEET] += 1
         
     def increment_replies(self):
-        self.current_replies += 1
+        self.counts[_REPLY] += 1
     
     def reset_daily_counts(self):
-        self.current_posts = 0
-        self.current_likes = 0
-        self.current_retweets = 0
-        self.current_replies = 0
+        self.counts[:] = _ZERO_COUNTS
 
 
 class ConfigManager:
     """Comprehensive configuration management system"""
+    __slots__ = (
+        'config_path', 'cache_path', 'json_path', 'config', '_frozen_config',
+        'platform_limits', '_ops_enabled', '_hashtag_table', '_sections'
+    )
     
     def __init__(self, config_path: str = "config.yaml"):
-        self.config_path = Path(config_path)
+        # Plain string paths; nothing here needs pathlib semantics
+        self.config_path = os.fspath(config_path)
+        self.cache_path = self.config_path + '.cache'
+        # Machine copy beside the pickle sidecar; it holds the same secrets as
+        # the YAML, so it gets an ignored name rather than config.json
+        self.json_path = self.config_path + '.json'
+        # Mutable tree for updates and saving; readers get the frozen view
         self.config: Dict[str, Any] = {}
+        self._frozen_config: Mapping[str, Any] = _EMPTY_SECTION
         self.platform_limits: Dict[str, PlatformLimits] = {}
-        self.emergency_stop = False
+        # Cleared by an emergency stop; read first on every permission check
+        self._ops_enabled = True
+        self._hashtag_table: Dict[str, Tuple[str, ...]] = {}
+        # Env-merged config sections, built once per loaded config
+        self._sections: Dict[str, Mapping[str, Any]] = {}
         self.load_config()
         self.setup_platform_limits()
+        self._build_hashtag_table()
         
     def load_config(self) -> None:
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file (or its up-to-date JSON copy)"""
         try:
-            if not self.config_path.exists():
-                raise FileNotFoundError(f"Configuration file {self.config_path} not found")
-                
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f)
-                
-            logger.info(f"Configuration loaded from {self.config_path}")
-            self._validate_config()
-            
+            self._read_config()
         except Exception as e:
-            logger.error(f"Error loading configuration: {e}")
+            logger.error("Error loading configuration: %s", e)
             raise
+        
+        self._refresh_frozen_config()
+    
+    def _refresh_frozen_config(self) -> None:
+        """Swap in a read-only snapshot of the current config tree"""
+        # A single assignment, so readers never see a half-updated tree
+        self._frozen_config = _freeze(self.config)
+        self._sections.clear()
+    
+    def _read_config(self) -> None:
+        """Read the config tree from the freshest available source"""
+        # libyaml decodes bytes itself, skipping the text-mode decode
+        try:
+            f = open(self.config_path, 'rb')
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Configuration file {self.config_path} not found") from e
+        
+        with f:
+            stat = os.fstat(f.fileno())
+            
+            # A JSON copy written from this exact YAML version replaces YAML parsing
+            json_config = self._read_json_config(stat)
+            if json_config is not None:
+                self.config = json_config
+                logger.info("Configuration loaded from %s", self.json_path)
+                self._validate_config()
+                return
+            
+            cached = self._read_config_cache(stat)
+            if cached is not None:
+                self.config = cached
+                logger.info("Configuration loaded from %s", self.cache_path)
+                return
+            
+            if stat.st_size >= _MMAP_MIN_CONFIG_SIZE:
+                # Parser reads straight from the page cache, no file-size bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    self.config = yaml.load(mapped, Loader=_YamlLoader)
+            else:
+                self.config = yaml.load(f, Loader=_YamlLoader)
+            
+        logger.info("Configuration loaded from %s", self.config_path)
+        self._validate_config()
+        self._write_config_cache(stat)
+    
+    def _read_json_config(self, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Load the JSON config copy if it was written from this exact YAML version"""
+        try:
+            with open(self.json_path, 'rb') as f:
+                data = f.read()
+            saved = orjson.loads(data) if orjson else json.loads(data)
+            # Copied or extracted YAML can carry an older mtime, so only an
+            # exact match counts; anything else falls through to the YAML
+            if saved.get('source') != [stat.st_mtime_ns, stat.st_size]:
+                return None
+            return saved['config']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable JSON config %s: %s", self.json_path, e)
+            return None
+    
+    def _write_json_config(self, stat: os.stat_result) -> None:
+        """Atomically write the JSON config copy, keyed to the YAML version it mirrors"""
+        tmp_path = f"{self.json_path}.{os.getpid()}.tmp"
+        try:
+            saved = {'source': [stat.st_mtime_ns, stat.st_size], 'config': self.config}
+            if orjson:
+                data = orjson.dumps(saved, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(saved, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.json_path)
+        except Exception as e:
+            logger.warning("Could not write JSON config %s: %s", self.json_path, e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    def _cache_header(self, stat: os.stat_result) -> bytes:
+        """Sidecar header identifying the YAML file version it was built from"""
+        return _CONFIG_CACHE_HEADER.pack(stat.st_mtime_ns, stat.st_size, _CONFIG_CACHE_VERSION)
+    
+    def _read_config_cache(self, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Load the pre-validated config if the sidecar matches the YAML file"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                if f.read(_CONFIG_CACHE_HEADER.size) != self._cache_header(stat):
+                    return None
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable config cache %s: %s", self.cache_path, e)
+            return None
+    
+    def _write_config_cache(self, stat: os.stat_result) -> None:
+        """Atomically write the validated config sidecar"""
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self._cache_header(stat))
+                pickle.dump(self.config, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning("Could not write config cache %s: %s", self.cache_path, e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
     
     def _validate_config(self) -> None:
         """Validate configuration structure and required fields"""
-        required_sections = ['ai', 'news_sources', 'twitter', 'facebook', 'telegram', 'content']
-        
-        for section in required_sections:
-            if section not in self.config:
-                raise ValueError(f"Missing required configuration section: {section}")
+        # Report every missing section at once
+        missing = _REQUIRED_SECTIONS.difference(self.config)
+        if missing:
+            raise ValueError(f"Missing required configuration section(s): {', '.join(sorted(missing))}")
                 
         # Validate AI keys
         ai_keys = self.config['ai'].get('primary_keys', [])
         if not ai_keys:
             raise ValueError("No AI primary keys configured")
             
-        # Check for placeholder patterns
-        placeholder_patterns = ["YOUR_GROQ_KEY", "GROQ_API_KEY", "your_api_key", ""]
-        valid_keys = [
-            key for key in ai_keys 
-            if key and not any(pattern in key for pattern in placeholder_patterns) and len(key) > 20
-        ]
+        # Count keys that are long enough and not placeholders (one regex scan
+        # each, or a single scan over all keys for long lists)
+        if len(ai_keys) > _BATCH_KEY_SCAN_THRESHOLD:
+            valid_count = len(_VALID_KEY_LINE_RE.findall('\n'.join(key for key in ai_keys if key)))
+        else:
+            valid_count = sum(
+                1 for key in ai_keys
+                if key and len(key) > 20 and not _PLACEHOLDER_KEY_RE.search(key)
+            )
         
         # Also check environment variable for GROQ key
         env_key = os.getenv('GROQ_API_KEY')
-        if env_key and len(env_key.strip()) > 10:
-            valid_keys.append(env_key)
+        if env_key and len(env_key.strip()) > 10 and not env_key.startswith(_PLACEHOLDER_PREFIXES):
+            valid_count += 1
         
-        if not valid_keys:
+        if not valid_count:
             logger.warning("❌ AI keys not configured - system will use fallback processing")
         else:
-            logger.info(f"✅ Found {len(valid_keys)} valid AI keys")
+            logger.info("✅ Found %s valid AI keys", valid_count)
             
         logger.info("Configuration validation completed successfully")
     
     def setup_platform_limits(self) -> None:
         """Initialize platform-specific daily limits"""
-        # Twitter limits
-        twitter_config = self.config.get('twitter', {}).get('limits', {})
-        self.platform_limits['twitter'] = PlatformLimits(
-            max_posts_per_day=twitter_config.get('max_posts_per_day', 50),
-            max_likes_per_day=twitter_config.get('max_likes_per_day', 100),
-            max_retweets_per_day=twitter_config.get('max_retweets_per_day', 30),
-            max_replies_per_day=twitter_config.get('max_replies_per_day', 25)
-        )
-        
-        # Facebook limits
-        facebook_config = self.config.get('facebook', {}).get('limits', {})
-        self.platform_limits['facebook'] = PlatformLimits(
-            max_posts_per_day=facebook_config.get('max_posts_per_day', 10)
-        )
-        
-        # Telegram limits
-        telegram_config = self.config.get('telegram', {}).get('limits', {})
-        self.platform_limits['telegram'] = PlatformLimits(
-            max_posts_per_day=telegram_config.get('max_posts_per_day', 100)
-        )
+        for platform, defaults in _PLATFORM_LIMIT_DEFAULTS.items():
+            limits_config = (self.config.get(platform) or _EMPTY_SECTION).get('limits') or _EMPTY_SECTION
+            self.platform_limits[platform] = PlatformLimits(
+                **{name: limits_config.get(name, default) for name, default in defaults.items()}
+            )
         
         logger.info("Platform limits initialized successfully")
     
-    def get_ai_config(self) -> Dict[str, Any]:
+    def get_ai_config(self) -> Mapping[str, Any]:
         """Get AI configuration including GROQ keys from environment"""
-        ai_config = self.config.get('ai', {})
+        cached = self._sections.get('ai')
+        if cached is not None:
+            return cached
+        
+        ai_config = dict(self._frozen_config.get('ai', _EMPTY_SECTION))
         
         # Load all GROQ API keys from environment
         env_keys = []
         for key_name in ['GROQ_API_KEY', 'GROQ_API_KEY_2', 'GROQ_API_KEY_3', 'GROQ_API_KEY_4', 'GROQ_API_KEY_5']:
             env_key = os.getenv(key_name)
-            if env_key and len(env_key.strip()) > 10 and not env_key.startswith('your_'):
+            if env_key and len(env_key.strip()) > 10 and not env_key.startswith(_PLACEHOLDER_PREFIXES):
                 env_keys.append(env_key)
         
         if env_keys:
             # Replace config keys with environment keys
-            ai_config['primary_keys'] = env_keys
-            logger.info(f"✅ Loaded {len(env_keys)} GROQ API keys from environment")
+            ai_config['primary_keys'] = tuple(env_keys)
+            logger.info("✅ Loaded %s GROQ API keys from environment", len(env_keys))
         
+        ai_config = self._sections['ai'] = MappingProxyType(ai_config)
         return ai_config
     
-    def get_twitter_config(self) -> Dict[str, Any]:
+    def get_twitter_config(self) -> Mapping[str, Any]:
         """Get Twitter configuration with environment variables"""
-        twitter_config = self.config.get('twitter', {}).copy()
+        cached = self._sections.get('twitter')
+        if cached is not None:
+            return cached
+        
+        twitter_config = dict(self._frozen_config.get('twitter', _EMPTY_SECTION))
         
         # Load credentials from environment
         username = os.getenv('TWITTER_USERNAME')
@@ -172,12 +378,17 @@ class ConfigManager:
             twitter_config['username'] = username
         if password and not password.startswith('your_'):
             twitter_config['password'] = password
-            
+        
+        twitter_config = self._sections['twitter'] = MappingProxyType(twitter_config)
         return twitter_config
     
-    def get_facebook_config(self) -> Dict[str, Any]:
+    def get_facebook_config(self) -> Mapping[str, Any]:
         """Get Facebook configuration with environment variables"""
-        facebook_config = self.config.get('facebook', {}).copy()
+        cached = self._sections.get('facebook')
+        if cached is not None:
+            return cached
+        
+        facebook_config = dict(self._frozen_config.get('facebook', _EMPTY_SECTION))
         
         # Load credentials from environment
         access_token = os.getenv('FACEBOOK_ACCESS_TOKEN')
@@ -187,12 +398,17 @@ class ConfigManager:
             facebook_config['access_token'] = access_token
         if page_id and not page_id.startswith('your_'):
             facebook_config['page_id'] = page_id
-            
+        
+        facebook_config = self._sections['facebook'] = MappingProxyType(facebook_config)
         return facebook_config
     
-    def get_telegram_config(self) -> Dict[str, Any]:
+    def get_telegram_config(self) -> Mapping[str, Any]:
         """Get Telegram configuration with environment variables"""
-        telegram_config = self.config.get('telegram', {}).copy()
+        cached = self._sections.get('telegram')
+        if cached is not None:
+            return cached
+        
+        telegram_config = dict(self._frozen_config.get('telegram', _EMPTY_SECTION))
         
         # Load credentials from environment
         bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -202,80 +418,70 @@ class ConfigManager:
             telegram_config['bot_token'] = bot_token
         if channel_id and not channel_id.startswith('your_'):
             telegram_config['channel_id'] = channel_id
-            
+        
+        telegram_config = self._sections['telegram'] = MappingProxyType(telegram_config)
         return telegram_config
     
-    def get_news_sources_config(self) -> Dict[str, Any]:
+    def get_news_sources_config(self) -> Mapping[str, Any]:
         """Get news sources configuration"""
-        return self.config.get('news_sources', {})
+        return self._frozen_config.get('news_sources', _EMPTY_SECTION)
     
-    def get_content_config(self) -> Dict[str, Any]:
+    def get_content_config(self) -> Mapping[str, Any]:
         """Get content processing configuration"""
-        return self.config.get('content', {})
+        return self._frozen_config.get('content', _EMPTY_SECTION)
     
-    def get_deduplication_config(self) -> Dict[str, Any]:
+    def get_deduplication_config(self) -> Mapping[str, Any]:
         """Get deduplication configuration"""
-        return self.config.get('deduplication', {})
+        return self._frozen_config.get('deduplication', _EMPTY_SECTION)
     
-    def get_websub_config(self) -> Dict[str, Any]:
+    def get_websub_config(self) -> Mapping[str, Any]:
         """Get WebSub server configuration"""
-        return self.config.get('websub', {})
+        return self._frozen_config.get('websub', _EMPTY_SECTION)
     
-    def get_database_config(self) -> Dict[str, Any]:
+    def get_database_config(self) -> Mapping[str, Any]:
         """Get database configuration"""
-        return self.config.get('database', {})
+        return self._frozen_config.get('database', _EMPTY_SECTION)
     
-    def get_error_handling_config(self) -> Dict[str, Any]:
+    def get_error_handling_config(self) -> Mapping[str, Any]:
         """Get error handling configuration"""
-        return self.config.get('error_handling', {})
+        return self._frozen_config.get('error_handling', _EMPTY_SECTION)
     
     def get_platform_limits(self, platform: str) -> Optional[PlatformLimits]:
         """Get platform-specific limits"""
         return self.platform_limits.get(platform)
     
+    @property
+    def emergency_stop(self) -> bool:
+        """Whether an emergency stop is active"""
+        return not self._ops_enabled
+    
+    @emergency_stop.setter
+    def emergency_stop(self, stopped: bool) -> None:
+        self._ops_enabled = not stopped
+    
     def can_post_to_platform(self, platform: str) -> bool:
         """Check if posting is allowed on platform"""
-        if self.emergency_stop:
-            return False
-        
-        limits = self.get_platform_limits(platform)
-        return limits.can_post() if limits else False
+        limits = self.platform_limits.get(platform)
+        return self._ops_enabled and limits is not None and limits.counts[_POST] < limits.caps[_POST]
     
     def can_engage_on_platform(self, platform: str, action: str) -> bool:
         """Check if engagement action is allowed on platform"""
-        if self.emergency_stop:
-            return False
-            
-        limits = self.get_platform_limits(platform)
-        if not limits:
-            return False
-            
-        action_methods = {
-            'like': limits.can_like,
-            'retweet': limits.can_retweet,
-            'reply': limits.can_reply
-        }
-        
-        method = action_methods.get(action)
-        return method() if method else False
+        index = _ACTION_INDEX.get(action) if action in _ENGAGE_ACTIONS else None
+        limits = self.platform_limits.get(platform)
+        return (self._ops_enabled and index is not None and limits is not None
+                and limits.counts[index] < limits.caps[index])
     
     def record_platform_action(self, platform: str, action: str) -> None:
         """Record platform action for limit tracking"""
-        limits = self.get_platform_limits(platform)
+        limits = self.platform_limits.get(platform)
         if not limits:
             return
-            
-        action_methods = {
-            'post': limits.increment_posts,
-            'like': limits.increment_likes,
-            'retweet': limits.increment_retweets,
-            'reply': limits.increment_replies
-        }
         
-        method = action_methods.get(action)
-        if method:
-            method()
-            logger.debug(f"Recorded {action} action for {platform}")
+        index = _ACTION_INDEX.get(action)
+        if index is not None:
+            limits.counts[index] += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Recorded %s action for %s", action, platform)
     
     def reset_daily_limits(self) -> None:
         """Reset all daily limits for new day"""
@@ -285,59 +491,73 @@ class ConfigManager:
     
     def trigger_emergency_stop(self, reason: str = "") -> None:
         """Trigger emergency stop for all operations"""
-        self.emergency_stop = True
-        logger.critical(f"EMERGENCY STOP TRIGGERED: {reason}")
+        self._ops_enabled = False
+        logger.critical("EMERGENCY STOP TRIGGERED: %s", reason)
     
     def release_emergency_stop(self) -> None:
         """Release emergency stop"""
-        self.emergency_stop = False
+        self._ops_enabled = True
         logger.info("Emergency stop released")
     
     def is_emergency_stopped(self) -> bool:
         """Check if emergency stop is active"""
-        return self.emergency_stop
+        return not self._ops_enabled
     
     def update_niche_keywords(self, new_keywords: List[str]) -> None:
         """Dynamically update niche keywords for customization"""
         self.config['twitter']['engagement']['keywords_to_like'] = new_keywords
-        logger.info(f"Updated keywords to: {new_keywords}")
+        self._refresh_frozen_config()
+        logger.info("Updated keywords to: %s", new_keywords)
     
     def update_target_usernames(self, new_usernames: List[str]) -> None:
         """Dynamically update target usernames"""
         self.config['twitter']['engagement']['target_usernames'] = new_usernames
-        logger.info(f"Updated target usernames to: {new_usernames}")
+        self._refresh_frozen_config()
+        logger.info("Updated target usernames to: %s", new_usernames)
     
     def save_config(self) -> None:
         """Save current configuration back to file"""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config, f, default_flow_style=False, indent=2)
+            # libyaml emits encoded bytes straight into the file; the temp
+            # file plus os.replace keeps a crash from leaving a torn config
+            tmp_path = f"{self.config_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    yaml.dump(self.config, f, Dumper=_YamlDumper, default_flow_style=False, indent=2,
+                              allow_unicode=True, encoding='utf-8')
+                os.replace(tmp_path, self.config_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            
+            # Machine-readable copy, written after the YAML so it loads in its place
+            self._write_json_config(os.stat(self.config_path))
             logger.info("Configuration saved successfully")
         except Exception as e:
-            logger.error(f"Error saving configuration: {e}")
+            logger.error("Error saving configuration: %s", e)
             raise
     
-    def get_hashtags_for_topic(self, topic: str) -> List[str]:
-        """Get appropriate hashtags for a topic"""
+    def _build_hashtag_table(self) -> None:
+        """Precompute the size-limited hashtag tuple for each topic bucket"""
         hashtag_config = self.get_content_config().get('hashtags', {})
         max_hashtags = hashtag_config.get('max_hashtags', 3)
         
-        # Topic-specific hashtags
-        if 'ai' in topic.lower() or 'artificial' in topic.lower() or 'machine learning' in topic.lower():
-            hashtags = hashtag_config.get('ai_related', [])
-        elif 'blockchain' in topic.lower() or 'crypto' in topic.lower():
-            hashtags = hashtag_config.get('blockchain', [])
-        elif 'cloud' in topic.lower():
-            hashtags = hashtag_config.get('cloud', [])
-        elif 'security' in topic.lower() or 'cyber' in topic.lower():
-            hashtags = hashtag_config.get('security', [])
-        else:
-            hashtags = hashtag_config.get('general', [])
-        
-        # Limit number of hashtags
-        return hashtags[:max_hashtags]
+        self._hashtag_table = {
+            bucket: tuple(hashtag_config.get(bucket, [])[:max_hashtags])
+            for bucket in [name for _, name in _TOPIC_BUCKETS] + ['general']
+        }
+    
+    def get_hashtags_for_topic(self, topic: str) -> Tuple[str, ...]:
+        """Get appropriate hashtags for a topic"""
+        for pattern, bucket in _TOPIC_BUCKETS:
+            if pattern.search(topic):
+                return self._hashtag_table[bucket]
+        return self._hashtag_table['general']
     
-    def get_human_behavior_config(self) -> Dict[str, Any]:
+    def get_human_behavior_config(self) -> Mapping[str, Any]:
         """Get human-like behavior configuration for Twitter"""
         return self.get_twitter_config().get('behavior', {})
     
@@ -346,4 +566,5 @@ class ConfigManager:
         logger.info("Reloading configuration...")
         self.load_config()
         self.setup_platform_limits()
+        self._build_hashtag_table()
         logger.info("Configuration reloaded successfully")
\ No newline at end of file
@@ -4,61 +4,232 @@ Smart Deduplication Engine
 Advanced content deduplication using similarity analysis and semantic comparison
 """
 
+import functools
 import hashlib
 import logging
-from datetime import datetime, timedelta
+import random
+import re
+import struct
+import time
+from collections import Counter
+from datetime import datetime
 from typing import Dict, List, Optional, Set, Tuple, Any
 from difflib import SequenceMatcher
 import asyncio
 import json
 
 import redis
+from redis.asyncio import Redis as AsyncRedis
 from textstat import flesch_reading_ease
-from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer
 import nltk
 
 from core.config_manager import ConfigManager
+from core.ttl_cache import TTLCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
+# MinHash/LSH over fingerprint key words. With the default 0.8 threshold a
+# duplicate needs key-word Jaccard >= 0.5, which 32 bands of 4 rows still
+# surface with ~87% probability (~99% at 0.6) while pairs near 0.2 rarely
+# collide.
+_MINHASH_PERMUTATIONS = 128
+_LSH_BANDS = 32
+_LSH_ROWS = _MINHASH_PERMUTATIONS // _LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_BAND_STRUCT = struct.Struct(f'<{_LSH_ROWS}Q')
+
+# Fixed seed: signatures are shared through Redis, so every process must
+# draw the same permutations
+_rng = random.Random(0x6E657773)
+_MINHASH_PARAMS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(_MINHASH_PERMUTATIONS)
+]
+del _rng
+
+# Smart quotes fold to ASCII so typographic variants hash identically
+_NORMALIZE_TABLE = str.maketrans({
+    '\u201c': '"', '\u201d': '"',
+    '\u2018': "'", '\u2019': "'",
+})
+_WHITESPACE_RE = re.compile(r'\s+')
+_DIGIT_RE = re.compile(r'\d')
+# Regex tokenizers stand in for NLTK punkt: only alphabetic words are kept as
+# key words, and a terminal-punctuation split is enough for news sentences
+_WORD_RE = re.compile(r'[^\W\d_]+')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_LINK_RE = re.compile(r'http|www', re.IGNORECASE)
+
+# Topic indicators in priority order; substring tests run at C speed, which
+# beats a single regex alternation over this many phrases
+_TECH_INDICATORS = (
+    'ai', 'artificial intelligence', 'machine learning', 'deep learning',
+    'neural network', 'automation', 'robot', 'blockchain', 'cryptocurrency',
+    'bitcoin', 'ethereum', 'cloud computing', 'aws', 'azure', 'google cloud',
+    'cybersecurity', 'hacker', 'data breach', 'privacy', 'gdpr',
+    'startup', 'funding', 'venture capital', 'ipo', 'acquisition',
+    'software', 'app', 'mobile', 'web', 'internet', 'tech', 'technology',
+    'innovation', 'digital', 'platform', 'api', 'database', 'server'
+)
+_MAX_TOPIC_INDICATORS = 10
+
+# 64-bit SimHash over word shingles; reposts within a few bits of each other
+# are near-identical and skip the weighted comparison entirely
+_SIMHASH_SHINGLE_SIZE = 3
+_SIMHASH_MAX_DISTANCE = 6
+
+# In-memory fallback bounds (hashes and URLs, fingerprints)
+_MEMORY_HASH_LIMIT = 100000
+_MEMORY_FINGERPRINT_LIMIT = 10000
+
+# Redis fingerprints mirrored in process memory
+_FINGERPRINT_MIRROR_SIZE = 10000
+
+# Recently hashed article bodies (retries and multi-feed copies repeat them)
+_CONTENT_HASH_CACHE_SIZE = 4096
+
+# Distinct words whose Porter stems are memoized per fingerprinter
+_STEM_CACHE_SIZE = 50000
+
+# Fingerprint similarity component weights
+_WORD_WEIGHT = 0.4
+_SENTENCE_WEIGHT = 0.3
+_TOPIC_WEIGHT = 0.2
+_STRUCTURE_WEIGHT = 0.1
+
+# Keys per SCAN page and per MGET/UNLINK batch
+_REDIS_BATCH_SIZE = 500
+
+# Sorted sets of stored members scored by expiry time, so stats need no KEYS scan
+_HASH_INDEX = "dedup:index:hash"
+_FINGERPRINT_INDEX = "dedup:index:fingerprint"
+_URL_INDEX = "dedup:index:url"
+
+# LSH buckets are sorted sets scored by member expiry, trimmed on read. The
+# prefix differs from the old set-typed buckets, which simply expire
+_LSH_BUCKET_PREFIX = "lsh:z:"
+
+# Atomic check-and-store of a dedup key in one round-trip. Returns 1 if
+# KEYS[1] already exists; otherwise sets it (ARGV[1] ttl, ARGV[2] value),
+# indexes ARGV[4] under expiry ARGV[3] in KEYS[2] and, when given, writes
+# the processed marker KEYS[3] with value ARGV[5]
+_CLAIM_KEY_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 1
+end
+redis.call('SETEX', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+if KEYS[3] then
+    redis.call('SETEX', KEYS[3], ARGV[1], ARGV[5])
+end
+return 0
+"""
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _ensure_nltk_data(resource: str, package: str):
+    """Download an NLTK data package only when it is not installed yet"""
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_stopwords() -> frozenset:
+    """English stopwords, loaded once per process"""
+    _ensure_nltk_data('corpora/stopwords', 'stopwords')
+    return frozenset(stopwords.words('english'))
+
+
+def _pack_fingerprint(fingerprint: Dict, use_msgpack: bool) -> bytes:
+    """Serialize a fingerprint for Redis as msgpack or compact JSON"""
+    if use_msgpack:
+        return msgpack.packb(fingerprint, use_bin_type=True)
+    if orjson:
+        return orjson.dumps(fingerprint)
+    return json.dumps(fingerprint, separators=(',', ':')).encode('utf-8')
+
+
+def _unpack_fingerprint(data: bytes) -> Optional[Dict]:
+    """Deserialize a stored fingerprint, or None if it cannot be decoded here"""
+    # A JSON object starts with '{', which is never a msgpack map header
+    if data[:1] == b'{':
+        return _json_loads(data)
+    if msgpack:
+        return msgpack.unpackb(data, raw=False)
+    return None
+
+
+def _split_sentences(content: str) -> List[str]:
+    """Split content into non-empty sentences"""
+    return [sentence for sentence in _SENTENCE_SPLIT_RE.split(content.strip()) if sentence]
+
+
+def _short_hash(text: str) -> str:
+    """128-bit blake2b hex digest used for dedup keys"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _normalize_text(content: str) -> str:
+    """Normalize content for consistent hashing"""
+    # Fold quote variants, collapse whitespace runs and normalize case
+    content = _WHITESPACE_RE.sub(' ', content.translate(_NORMALIZE_TABLE))
+    return content.strip().lower()
+
+
+@functools.lru_cache(maxsize=_CONTENT_HASH_CACHE_SIZE)
+def _content_hash(content: str) -> str:
+    """Normalized content hash, memoized for articles seen repeatedly"""
+    return _short_hash(_normalize_text(content))
+
 
 class ContentFingerprint:
     """Create and manage content fingerprints for deduplication"""
     
     def __init__(self):
         self.stemmer = PorterStemmer()
+        # News vocabulary repeats heavily and PorterStemmer is pure Python
+        self._stem = functools.lru_cache(maxsize=_STEM_CACHE_SIZE)(self.stemmer.stem)
         try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            self.stopwords = set(stopwords.words('english'))
+            self.stopwords = _get_stopwords()
         except Exception as e:
             logger.warning(f"NLTK setup issue: {e}")
-            self.stopwords = set()
+            self.stopwords = frozenset()
     
     def create_content_hash(self, content: str) -> str:
         """Create content hash for exact duplicate detection"""
-        # Normalize content
-        normalized = self._normalize_content(content)
-        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        return _content_hash(content)
     
     def create_semantic_fingerprint(self, content: str) -> Dict[str, Any]:
         """Create semantic fingerprint for similarity detection"""
         try:
-            # Extract key features
-            words = self._extract_key_words(content)
-            sentences = self._extract_key_sentences(content)
+            # Tokenize once and share the results between extractors
+            sentences = _split_sentences(content)
+            words = content.split()
             
             # Create fingerprint
             fingerprint = {
-                'key_words': words,
-                'key_sentences': sentences,
-                'word_count': len(content.split()),
-                'sentence_count': len(sent_tokenize(content)),
+                'key_words': self._extract_key_words(content),
+                'key_sentences': self._extract_key_sentences(content, sentences),
+                'word_count': len(words),
+                'sentence_count': len(sentences),
                 'reading_ease': flesch_reading_ease(content) if content.strip() else 0,
-                'content_structure': self._analyze_structure(content),
-                'topic_indicators': self._extract_topic_indicators(content)
+                'content_structure': self._analyze_structure(content, sentences, words),
+                'topic_indicators': self._extract_topic_indicators(content),
+                'simhash': self.create_simhash(words)
             }
             
             return fingerprint
@@ -67,50 +238,72 @@ class ContentFingerprint:
             logger.error(f"Semantic fingerprint creation error: {e}")
             return self._create_basic_fingerprint(content)
     
-    def _normalize_content(self, content: str) -> str:
-        """Normalize content for consistent hashing"""
-        # Remove extra whitespace and normalize case
-        content = ' '.join(content.lower().split())
+    def create_simhash(self, words: List[str]) -> int:
+        """64-bit SimHash of lowercased word shingles"""
+        if not words:
+            return 0
         
-        # Remove common variations
-        content = content.replace('\n', ' ').replace('\t', ' ')
-        content = content.replace('"', '"').replace('"', '"')
-        content = content.replace(''', "'").replace(''', "'")
+        shingle_count = max(len(words) - _SIMHASH_SHINGLE_SIZE + 1, 1)
+        hashes = [
+            hashlib.blake2b(
+                ' '.join(words[i:i + _SIMHASH_SHINGLE_SIZE]).lower().encode('utf-8'), digest_size=8
+            ).digest()
+            for i in range(shingle_count)
+        ]
         
-        return content.strip()
+        # Majority vote per bit position, counted column-wise over bit strings
+        half = len(hashes) / 2
+        bit_strings = (format(int.from_bytes(digest, 'big'), '064b') for digest in hashes)
+        bits = ''.join('1' if column.count('1') > half else '0' for column in zip(*bit_strings))
+        return int(bits, 2)
+    
+    def create_lsh_band_keys(self, key_words: List[str]) -> List[str]:
+        """MinHash the key words and return one LSH bucket key per band"""
+        if not key_words:
+            return []
+        
+        hashes = [
+            int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+            for word in set(key_words)
+        ]
+        signature = [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in _MINHASH_PARAMS
+        ]
+        
+        band_keys = []
+        for band in range(_LSH_BANDS):
+            rows = signature[band * _LSH_ROWS:(band + 1) * _LSH_ROWS]
+            digest = hashlib.blake2b(_BAND_STRUCT.pack(*rows), digest_size=8).hexdigest()
+            band_keys.append(f"b{band}:{digest}")
+        return band_keys
     
     def _extract_key_words(self, content: str) -> List[str]:
         """Extract key words from content"""
         try:
-            words = word_tokenize(content.lower())
+            words = _WORD_RE.findall(content.lower())
+            stop_words = self.stopwords
+            stem = self._stem
             
             # Filter out stopwords and short words
             key_words = [
-                self.stemmer.stem(word) 
+                stem(word) 
                 for word in words 
                 if (word.isalpha() and 
                     len(word) > 3 and 
-                    word not in self.stopwords)
+                    word not in stop_words)
             ]
             
-            # Return most frequent words
-            word_freq = {}
-            for word in key_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
-            
-            # Sort by frequency and return top words
-            sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-            return [word for word, freq in sorted_words[:20]]
+            # Return most frequent words (ties keep first-seen order)
+            return [word for word, freq in Counter(key_words).most_common(20)]
             
         except Exception as e:
             logger.error(f"Key word extraction error: {e}")
             return content.lower().split()[:20]
     
-    def _extract_key_sentences(self, content: str) -> List[str]:
+    def _extract_key_sentences(self, content: str, sentences: List[str]) -> List[str]:
         """Extract key sentences from content"""
         try:
-            sentences = sent_tokenize(content)
-            
             # Score sentences by length and position
             scored_sentences = []
             for i, sentence in enumerate(sentences):
@@ -129,12 +322,10 @@ class ContentFingerprint:
             logger.error(f"Key sentence extraction error: {e}")
             return content.split('.')[:5]
     
-    def _analyze_structure(self, content: str) -> Dict[str, Any]:
+    def _analyze_structure(self, content: str, sentences: List[str], words: List[str]) -> Dict[str, Any]:
         """Analyze content structure"""
         try:
             paragraphs = content.split('\n\n')
-            sentences = sent_tokenize(content)
-            words = content.split()
             
             return {
                 'paragraph_count': len(paragraphs),
@@ -143,33 +334,26 @@ class ContentFingerprint:
                 'avg_sentence_length': sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0,
                 'word_count': len(words),
                 'has_quotes': '"' in content or "'" in content,
-                'has_numbers': any(char.isdigit() for char in content),
-                'has_links': 'http' in content.lower() or 'www' in content.lower()
+                'has_numbers': _DIGIT_RE.search(content) is not None,
+                'has_links': _LINK_RE.search(content) is not None
             }
             
         except Exception as e:
             logger.error(f"Structure analysis error: {e}")
-            return {'word_count': len(content.split())}
+            return {'word_count': len(words)}
     
     def _extract_topic_indicators(self, content: str) -> List[str]:
         """Extract topic indicators from content"""
-        tech_indicators = [
-            'ai', 'artificial intelligence', 'machine learning', 'deep learning',
-            'neural network', 'automation', 'robot', 'blockchain', 'cryptocurrency',
-            'bitcoin', 'ethereum', 'cloud computing', 'aws', 'azure', 'google cloud',
-            'cybersecurity', 'hacker', 'data breach', 'privacy', 'gdpr',
-            'startup', 'funding', 'venture capital', 'ipo', 'acquisition',
-            'software', 'app', 'mobile', 'web', 'internet', 'tech', 'technology',
-            'innovation', 'digital', 'platform', 'api', 'database', 'server'
-        ]
-        
         content_lower = content.lower()
-        found_indicators = [
-            indicator for indicator in tech_indicators 
-            if indicator in content_lower
-        ]
+        found_indicators = []
+        
+        for indicator in _TECH_INDICATORS:
+            if indicator in content_lower:
+                found_indicators.append(indicator)
+                if len(found_indicators) == _MAX_TOPIC_INDICATORS:
+                    break
         
-        return found_indicators[:10]  # Limit to top 10
+        return found_indicators
     
     def _create_basic_fingerprint(self, content: str) -> Dict[str, Any]:
         """Create basic fingerprint as fallback"""
@@ -200,15 +384,37 @@ class DeduplicationEngine:
         self.time_window_hours = self.dedup_config.get('time_window_hours', 24)
         self.content_hash_enabled = self.dedup_config.get('content_hash_enabled', True)
         self.semantic_analysis = self.dedup_config.get('semantic_analysis', True)
+        # JSON keeps stored fingerprints readable from redis-cli
+        fingerprint_format = self.dedup_config.get('fingerprint_format', 'msgpack')
+        self.use_msgpack = msgpack is not None and fingerprint_format == 'msgpack'
         
-        # Initialize Redis for caching
+        # Initialize Redis for caching; fingerprints are read through a
+        # second client that leaves values as bytes
         self.redis_client = None
+        self.binary_redis_client = None
+        self._claim_script = None
         self._init_redis()
         
-        # In-memory cache as fallback
-        self.content_hashes: Set[str] = set()
-        self.content_fingerprints: Dict[str, Dict] = {}
-        self.processed_items: Dict[str, datetime] = {}
+        # In-memory cache as fallback; entries expire with the time window
+        # like their Redis counterparts, evicted on access instead of by a scan
+        window_seconds = self.time_window_hours * 3600
+        self.content_hashes = TTLCache(maxsize=_MEMORY_HASH_LIMIT, ttl=window_seconds)
+        self.content_fingerprints = TTLCache(
+            maxsize=_MEMORY_FINGERPRINT_LIMIT,
+            ttl=window_seconds,
+            on_evict=self._unindex_fingerprint
+        )
+        self.processed_items = TTLCache(maxsize=_MEMORY_HASH_LIMIT, ttl=window_seconds)
+        # LSH bucket key -> content ids whose fingerprints hash into it
+        self.lsh_buckets: Dict[str, Set[str]] = {}
+        # Local copies of Redis fingerprints; each carries its Redis expiry so
+        # a mirrored entry never outlives the stored one
+        self._fingerprint_mirror = TTLCache(
+            maxsize=_FINGERPRINT_MIRROR_SIZE,
+            ttl=self.time_window_hours * 3600
+        )
+        # Content hash -> pending check, so concurrent copies share one check
+        self._inflight: Dict[str, asyncio.Future] = {}
         
         logger.info("Deduplication engine initialized")
     
@@ -216,67 +422,95 @@ class DeduplicationEngine:
         """Initialize Redis connection"""
         try:
             db_config = self.config.get_database_config().get('redis', {})
-            self.redis_client = redis.Redis(
-                host=db_config.get('host', 'localhost'),
-                port=db_config.get('port', 6379),
-                db=db_config.get('db', 0),
-                password=db_config.get('password'),
-                decode_responses=True
-            )
+            connection_kwargs = {
+                'host': db_config.get('host', 'localhost'),
+                'port': db_config.get('port', 6379),
+                'db': db_config.get('db', 0),
+                'password': db_config.get('password'),
+            }
             
-            # Test connection
-            self.redis_client.ping()
+            # Test connection synchronously; the engine is built outside any
+            # awaitable setup step
+            probe = redis.Redis(**connection_kwargs)
+            try:
+                probe.ping()
+            finally:
+                probe.close()
+            
+            # Commands run on the event loop instead of hopping to worker threads
+            self.redis_client = AsyncRedis(decode_responses=True, **connection_kwargs)
+            self.binary_redis_client = AsyncRedis(decode_responses=False, **connection_kwargs)
+            self._claim_script = self.redis_client.register_script(_CLAIM_KEY_LUA)
             logger.info("Redis connection established")
             
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}. Using in-memory fallback.")
             self.redis_client = None
+            self.binary_redis_client = None
     
     async def is_duplicate(self, content: str, title: str = "", url: str = "") -> Tuple[bool, str, float]:
         """
         Check if content is a duplicate
         Returns: (is_duplicate, reason, similarity_score)
         """
+        content_hash = self.fingerprinter.create_content_hash(content)
+        
+        pending = self._inflight.get(content_hash)
+        if pending is not None:
+            # Identical content is already being checked, so this copy is an
+            # exact duplicate of it whatever that check decides
+            result = await asyncio.shield(pending)
+            if result[1] == "error_fallback":
+                return result
+            logger.debug("Exact duplicate detected via in-flight check")
+            return True, "exact_duplicate", 1.0
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[content_hash] = future
+        result = False, "error_fallback", 0.0
+        try:
+            result = await self._check_duplicate(content, title, url, content_hash)
+            return result
+        finally:
+            del self._inflight[content_hash]
+            future.set_result(result)
+    
+    async def _check_duplicate(self, content: str, title: str, url: str,
+                               content_hash: str) -> Tuple[bool, str, float]:
+        """Run the hash, semantic and URL duplicate checks in order"""
         try:
-            # Clean expired entries first
-            await self._clean_expired_entries()
-            
             # Create unique identifier
             content_id = f"{title}_{url}_{content[:100]}"
             
             # 1. Exact hash duplicate check
             if self.content_hash_enabled:
-                content_hash = self.fingerprinter.create_content_hash(content)
-                
-                if await self._is_hash_duplicate(content_hash):
+                # Checked and stored for future checks in one atomic step
+                if await self._claim_content_hash(content_hash, content_id):
                     logger.debug("Exact duplicate detected via hash")
                     return True, "exact_duplicate", 1.0
-                
-                # Store hash for future checks
-                await self._store_content_hash(content_hash, content_id)
             
             # 2. Semantic similarity check
             if self.semantic_analysis:
                 fingerprint = self.fingerprinter.create_semantic_fingerprint(content)
+                band_keys = self.fingerprinter.create_lsh_band_keys(fingerprint.get('key_words', []))
                 
-                similarity_result = await self._check_semantic_similarity(fingerprint, content_id)
+                similarity_result = await self._check_semantic_similarity(fingerprint, content_id, band_keys)
                 if similarity_result[0]:
                     logger.debug(f"Semantic duplicate detected: {similarity_result[2]:.2f} similarity")
                     return similarity_result
                 
                 # Store fingerprint for future checks
-                await self._store_fingerprint(content_id, fingerprint)
+                await self._store_fingerprint(content_id, fingerprint, band_keys)
             
             # 3. URL-based duplicate check
             if url:
-                if await self._is_url_duplicate(url):
+                if await self._claim_url(url, content_id):
                     logger.debug("URL duplicate detected")
                     return True, "url_duplicate", 0.9
-                
-                await self._store_processed_url(url, content_id)
+            else:
+                await self._record_processed_item(content_id)
             
             # Not a duplicate
-            await self._record_processed_item(content_id)
             return False, "unique", 0.0
             
         except Exception as e:
@@ -284,48 +518,71 @@ class DeduplicationEngine:
             # Fail safe - allow content through on error
             return False, "error_fallback", 0.0
     
-    async def _is_hash_duplicate(self, content_hash: str) -> bool:
-        """Check if content hash already exists"""
+    async def _claim_content_hash(self, content_hash: str, content_id: str) -> bool:
+        """Store a content hash unless it exists; returns True if it already did"""
         try:
             if self.redis_client:
-                return await asyncio.to_thread(
-                    self.redis_client.exists, f"hash:{content_hash}"
-                )
-            else:
-                return content_hash in self.content_hashes
-                
-        except Exception as e:
-            logger.error(f"Hash duplicate check error: {e}")
+                expire_seconds = self.time_window_hours * 3600
+                return bool(await self._claim_script(
+                    keys=[f"hash:{content_hash}", _HASH_INDEX],
+                    args=[expire_seconds, content_id, time.time() + expire_seconds, content_hash]
+                ))
+            
+            if content_hash in self.content_hashes:
+                return True
+            self.content_hashes[content_hash] = True
             return False
-    
-    async def _store_content_hash(self, content_hash: str, content_id: str):
-        """Store content hash with expiration"""
-        try:
-            expire_seconds = self.time_window_hours * 3600
             
-            if self.redis_client:
-                await asyncio.to_thread(
-                    self.redis_client.setex,
-                    f"hash:{content_hash}",
-                    expire_seconds,
-                    content_id
-                )
-            else:
-                self.content_hashes.add(content_hash)
-                
         except Exception as e:
-            logger.error(f"Hash storage error: {e}")
+            logger.error(f"Hash duplicate check error: {e}")
+            return False
     
-    async def _check_semantic_similarity(self, fingerprint: Dict, content_id: str) -> Tuple[bool, str, float]:
+    async def _check_semantic_similarity(self, fingerprint: Dict, content_id: str,
+                                         band_keys: List[str]) -> Tuple[bool, str, float]:
         """Check semantic similarity against stored fingerprints"""
         try:
-            stored_fingerprints = await self._get_stored_fingerprints()
+            if band_keys:
+                # Only fingerprints sharing an LSH bucket can reach the threshold
+                candidate_ids = await self._get_lsh_candidates(band_keys)
+                stored_fingerprints = await self._get_fingerprints(candidate_ids)
+            else:
+                # Basic fallback fingerprints carry no key words to hash
+                stored_fingerprints = await self._get_stored_fingerprints()
             
             max_similarity = 0.0
             most_similar_id = ""
             
+            simhash = fingerprint.get('simhash')
+            if simhash:
+                for stored_id, stored_fingerprint in stored_fingerprints.items():
+                    stored_simhash = stored_fingerprint.get('simhash')
+                    if not stored_simhash:
+                        continue
+                    distance = (simhash ^ stored_simhash).bit_count()
+                    if distance > _SIMHASH_MAX_DISTANCE:
+                        continue
+                    # The reported score must clear the configured threshold too
+                    similarity = 1.0 - distance / 64
+                    if similarity >= self.similarity_threshold:
+                        return True, f"near_duplicate_of_{stored_id}", similarity
+            
+            # Query-side sets are built once instead of per candidate
+            words = set(fingerprint.get('key_words', []))
+            topics = set(fingerprint.get('topic_indicators', []))
+            structure = fingerprint.get('content_structure', {})
+            sentences = fingerprint.get('key_sentences', [])
+            
             for stored_id, stored_fingerprint in stored_fingerprints.items():
-                similarity = self._calculate_similarity(fingerprint, stored_fingerprint)
+                similarity = self._calculate_partial_similarity(words, topics, structure, stored_fingerprint)
+                
+                # Sentence matching dominates the cost; skip it when even a
+                # perfect sentence score could not matter
+                upper_bound = similarity + _SENTENCE_WEIGHT
+                if upper_bound < self.similarity_threshold and upper_bound <= max_similarity:
+                    continue
+                similarity += _SENTENCE_WEIGHT * self._calculate_sentence_similarity(
+                    sentences, stored_fingerprint.get('key_sentences', [])
+                )
                 
                 if similarity > max_similarity:
                     max_similarity = similarity
@@ -351,10 +608,10 @@ class DeduplicationEngine:
             
             # Weighted combination
             total_similarity = (
-                word_sim * 0.4 +
-                sentence_sim * 0.3 +
-                topic_sim * 0.2 +
-                structure_sim * 0.1
+                word_sim * _WORD_WEIGHT +
+                sentence_sim * _SENTENCE_WEIGHT +
+                topic_sim * _TOPIC_WEIGHT +
+                structure_sim * _STRUCTURE_WEIGHT
             )
             
             return total_similarity
@@ -363,6 +620,30 @@ class DeduplicationEngine:
             logger.error(f"Similarity calculation error: {e}")
             return 0.0
     
+    def _calculate_partial_similarity(self, words: Set[str], topics: Set[str],
+                                      structure: Dict, fingerprint: Dict) -> float:
+        """Weighted word, topic and structure similarity, without sentences"""
+        partial = _STRUCTURE_WEIGHT * self._calculate_structure_similarity(
+            structure, fingerprint.get('content_structure', {})
+        )
+        
+        other_words = fingerprint.get('key_words')
+        if words and other_words:
+            partial += _WORD_WEIGHT * self._jaccard(words, other_words)
+        
+        other_topics = fingerprint.get('topic_indicators')
+        if topics and other_topics:
+            partial += _TOPIC_WEIGHT * self._jaccard(topics, other_topics)
+        
+        return partial
+    
+    @staticmethod
+    def _jaccard(set1: Set[str], items: List[str]) -> float:
+        """Jaccard index of a set and a list of items"""
+        intersection = len(set1.intersection(items))
+        union = len(set1) + len(set(items)) - intersection
+        return intersection / union if union > 0 else 0.0
+    
     def _calculate_word_similarity(self, words1: List[str], words2: List[str]) -> float:
         """Calculate word overlap similarity"""
         if not words1 or not words2:
@@ -379,12 +660,22 @@ class DeduplicationEngine:
         if not sentences1 or not sentences2:
             return 0.0
         
+        lowered1 = [s1.lower() for s1 in sentences1]
+        matcher = SequenceMatcher(None)
         max_similarity = 0.0
         
-        for s1 in sentences1:
-            for s2 in sentences2:
-                similarity = SequenceMatcher(None, s1.lower(), s2.lower()).ratio()
-                max_similarity = max(max_similarity, similarity)
+        for s2 in sentences2:
+            # SequenceMatcher caches its analysis of seq2, so vary seq1 only
+            matcher.set_seq2(s2.lower())
+            for s1 in lowered1:
+                matcher.set_seq1(s1)
+                # Cheap upper bounds skip pairs that cannot beat the best so far
+                if (matcher.real_quick_ratio() <= max_similarity or
+                        matcher.quick_ratio() <= max_similarity):
+                    continue
+                max_similarity = max(max_similarity, matcher.ratio())
+                if max_similarity == 1.0:
+                    return max_similarity
         
         return max_similarity
     
@@ -410,81 +701,158 @@ class DeduplicationEngine:
         # Similarity based on word count difference (smaller difference = higher similarity)
         return 1.0 - (word_count_diff / max_words)
     
-    async def _store_fingerprint(self, content_id: str, fingerprint: Dict):
-        """Store content fingerprint"""
+    async def _store_fingerprint(self, content_id: str, fingerprint: Dict, band_keys: List[str]):
+        """Store content fingerprint and index it in its LSH buckets"""
         try:
             expire_seconds = self.time_window_hours * 3600
-            fingerprint_data = json.dumps(fingerprint)
             
             if self.redis_client:
-                await asyncio.to_thread(
-                    self.redis_client.setex,
-                    f"fingerprint:{content_id}",
-                    expire_seconds,
-                    fingerprint_data
+                stored = dict(fingerprint, expires_at=time.time() + expire_seconds)
+                await self._store_fingerprint_redis(
+                    content_id, _pack_fingerprint(stored, self.use_msgpack), band_keys, expire_seconds
                 )
+                self._fingerprint_mirror[content_id] = stored
             else:
                 self.content_fingerprints[content_id] = fingerprint
+                for band_key in band_keys:
+                    self.lsh_buckets.setdefault(band_key, set()).add(content_id)
                 
         except Exception as e:
             logger.error(f"Fingerprint storage error: {e}")
     
-    async def _get_stored_fingerprints(self) -> Dict[str, Dict]:
-        """Get all stored fingerprints"""
+    async def _store_fingerprint_redis(self, content_id: str, fingerprint_data: bytes,
+                                       band_keys: List[str], expire_seconds: int):
+        """Write a fingerprint and its LSH bucket memberships in one round-trip"""
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            expires_at = time.time() + expire_seconds
+            pipe.setex(f"fingerprint:{content_id}", expire_seconds, fingerprint_data)
+            pipe.zadd(_FINGERPRINT_INDEX, {content_id: expires_at})
+            for band_key in band_keys:
+                # The key lives as long as its newest member; older ones are trimmed on read
+                pipe.zadd(f"{_LSH_BUCKET_PREFIX}{band_key}", {content_id: expires_at})
+                pipe.expire(f"{_LSH_BUCKET_PREFIX}{band_key}", expire_seconds)
+            await pipe.execute()
+    
+    async def _get_lsh_candidates(self, band_keys: List[str]) -> Set[str]:
+        """Get content ids sharing at least one LSH bucket"""
         try:
             if self.redis_client:
-                keys = await asyncio.to_thread(
-                    self.redis_client.keys, "fingerprint:*"
-                )
+                # Drop expired members, then read the live ones, in one round-trip
+                now = time.time()
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for band_key in band_keys:
+                        pipe.zremrangebyscore(f"{_LSH_BUCKET_PREFIX}{band_key}", '-inf', now)
+                        pipe.zrange(f"{_LSH_BUCKET_PREFIX}{band_key}", 0, -1)
+                    results = await pipe.execute()
                 
+                candidates = set()
+                for members in results[1::2]:
+                    candidates.update(members)
+                return candidates
+            
+            candidates = set()
+            for band_key in band_keys:
+                bucket = self.lsh_buckets.get(band_key)
+                if bucket:
+                    candidates |= bucket
+            return candidates
+            
+        except Exception as e:
+            logger.error(f"LSH candidate lookup error: {e}")
+            return set()
+    
+    async def _get_fingerprints(self, content_ids: Set[str]) -> Dict[str, Dict]:
+        """Get stored fingerprints for specific content ids"""
+        try:
+            if not content_ids:
+                return {}
+            
+            if self.redis_client:
+                now = time.time()
                 fingerprints = {}
-                for key in keys:
-                    data = await asyncio.to_thread(self.redis_client.get, key)
-                    if data:
-                        content_id = key.split(':', 1)[1]
-                        fingerprints[content_id] = json.loads(data)
-                        
-                return fingerprints
-            else:
-                return self.content_fingerprints.copy()
+                missing = []
+                for content_id in content_ids:
+                    fingerprint = self._fingerprint_mirror.get(content_id)
+                    if fingerprint is not None and fingerprint['expires_at'] > now:
+                        fingerprints[content_id] = fingerprint
+                    else:
+                        missing.append(content_id)
                 
+                if missing:
+                    values = await self.binary_redis_client.mget(
+                        [f"fingerprint:{content_id}" for content_id in missing]
+                    )
+                    # Bucket members may outlive their expired fingerprints
+                    for content_id, data in zip(missing, values):
+                        fingerprint = _unpack_fingerprint(data) if data else None
+                        if fingerprint is not None:
+                            fingerprints[content_id] = fingerprint
+                            if 'expires_at' in fingerprint:
+                                self._fingerprint_mirror[content_id] = fingerprint
+                return fingerprints
+            
+            return {
+                content_id: self.content_fingerprints[content_id]
+                for content_id in content_ids if content_id in self.content_fingerprints
+            }
+            
         except Exception as e:
             logger.error(f"Fingerprint retrieval error: {e}")
             return {}
     
-    async def _is_url_duplicate(self, url: str) -> bool:
-        """Check if URL has been processed"""
+    async def _get_stored_fingerprints(self) -> Dict[str, Dict]:
+        """Get all stored fingerprints"""
         try:
             if self.redis_client:
-                return await asyncio.to_thread(
-                    self.redis_client.exists, f"url:{hashlib.md5(url.encode()).hexdigest()}"
-                )
+                return await self._scan_fingerprints_redis()
             else:
-                url_hash = hashlib.md5(url.encode()).hexdigest()
-                return url_hash in self.processed_items
+                return dict(self.content_fingerprints.items())
                 
         except Exception as e:
-            logger.error(f"URL duplicate check error: {e}")
-            return False
+            logger.error(f"Fingerprint retrieval error: {e}")
+            return {}
+    
+    async def _scan_fingerprints_redis(self) -> Dict[str, Dict]:
+        """SCAN fingerprint keys and fetch them in MGET batches"""
+        fingerprints = {}
+        keys = []
+        async for key in self.redis_client.scan_iter(match="fingerprint:*", count=_REDIS_BATCH_SIZE):
+            keys.append(key)
+            if len(keys) >= _REDIS_BATCH_SIZE:
+                await self._mget_fingerprints(keys, fingerprints)
+                keys = []
+        if keys:
+            await self._mget_fingerprints(keys, fingerprints)
+        return fingerprints
     
-    async def _store_processed_url(self, url: str, content_id: str):
-        """Store processed URL"""
+    async def _mget_fingerprints(self, keys: List[str], fingerprints: Dict[str, Dict]):
+        """Fetch one batch of fingerprint keys into fingerprints"""
+        for key, data in zip(keys, await self.binary_redis_client.mget(keys)):
+            fingerprint = _unpack_fingerprint(data) if data else None
+            if fingerprint is not None:
+                fingerprints[key.split(':', 1)[1]] = fingerprint
+    
+    async def _claim_url(self, url: str, content_id: str) -> bool:
+        """Store a processed URL unless it exists; returns True if it already did"""
         try:
-            url_hash = hashlib.md5(url.encode()).hexdigest()
-            expire_seconds = self.time_window_hours * 3600
-            
+            url_hash = _short_hash(url)
             if self.redis_client:
-                await asyncio.to_thread(
-                    self.redis_client.setex,
-                    f"url:{url_hash}",
-                    expire_seconds,
-                    content_id
-                )
-            else:
-                self.processed_items[url_hash] = datetime.now()
-                
+                # The processed marker is written in the same script call
+                expire_seconds = self.time_window_hours * 3600
+                return bool(await self._claim_script(
+                    keys=[f"url:{url_hash}", _URL_INDEX, f"processed:{content_id}"],
+                    args=[expire_seconds, content_id, time.time() + expire_seconds, url_hash,
+                          datetime.now().isoformat()]
+                ))
+            
+            if url_hash in self.processed_items:
+                return True
+            self.processed_items[url_hash] = datetime.now()
+            return False
+            
         except Exception as e:
-            logger.error(f"URL storage error: {e}")
+            logger.error(f"URL duplicate check error: {e}")
+            return False
     
     async def _record_processed_item(self, content_id: str):
         """Record that an item has been processed"""
@@ -492,8 +860,7 @@ class DeduplicationEngine:
             expire_seconds = self.time_window_hours * 3600
             
             if self.redis_client:
-                await asyncio.to_thread(
-                    self.redis_client.setex,
+                await self.redis_client.setex(
                     f"processed:{content_id}",
                     expire_seconds,
                     datetime.now().isoformat()
@@ -502,36 +869,26 @@ class DeduplicationEngine:
         except Exception as e:
             logger.error(f"Processed item recording error: {e}")
     
-    async def _clean_expired_entries(self):
-        """Clean expired entries from in-memory cache"""
-        if not self.redis_client:  # Only need to clean in-memory cache
-            try:
-                current_time = datetime.now()
-                expired_keys = [
-                    key for key, timestamp in self.processed_items.items()
-                    if current_time - timestamp > timedelta(hours=self.time_window_hours)
-                ]
-                
-                for key in expired_keys:
-                    del self.processed_items[key]
-                
-                # Also clean fingerprints (simplified cleanup)
-                if len(self.content_fingerprints) > 10000:  # Arbitrary limit
-                    # Remove oldest half
-                    keys_to_remove = list(self.content_fingerprints.keys())[:5000]
-                    for key in keys_to_remove:
-                        del self.content_fingerprints[key]
-                        
-            except Exception as e:
-                logger.error(f"Cache cleanup error: {e}")
-    
-    def get_stats(self) -> Dict[str, Any]:
+    def _unindex_fingerprint(self, content_id: str, fingerprint: Dict):
+        """Remove an evicted in-memory fingerprint from its LSH buckets"""
+        for band_key in self.fingerprinter.create_lsh_band_keys(fingerprint.get('key_words', [])):
+            bucket = self.lsh_buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(content_id)
+                if not bucket:
+                    del self.lsh_buckets[band_key]
+    
+    async def get_stats(self) -> Dict[str, Any]:
         """Get deduplication statistics"""
         try:
             if self.redis_client:
-                hash_count = self.redis_client.eval("return #redis.call('keys', 'hash:*')", 0)
-                fingerprint_count = self.redis_client.eval("return #redis.call('keys', 'fingerprint:*')", 0)
-                url_count = self.redis_client.eval("return #redis.call('keys', 'url:*')", 0)
+                # Drop members whose keys have expired, then count the rest
+                now = time.time()
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for index in (_HASH_INDEX, _FINGERPRINT_INDEX, _URL_INDEX):
+                        pipe.zremrangebyscore(index, '-inf', now)
+                        pipe.zcard(index)
+                    _, hash_count, _, fingerprint_count, _, url_count = await pipe.execute()
             else:
                 hash_count = len(self.content_hashes)
                 fingerprint_count = len(self.content_fingerprints)
@@ -555,23 +912,41 @@ class DeduplicationEngine:
         try:
             if self.redis_client:
                 # Clear Redis keys
-                keys = await asyncio.to_thread(self.redis_client.keys, "hash:*")
-                keys.extend(await asyncio.to_thread(self.redis_client.keys, "fingerprint:*"))
-                keys.extend(await asyncio.to_thread(self.redis_client.keys, "url:*"))
-                keys.extend(await asyncio.to_thread(self.redis_client.keys, "processed:*"))
-                
-                if keys:
-                    await asyncio.to_thread(self.redis_client.delete, *keys)
+                await self._unlink_redis_keys(
+                    ("hash:*", "fingerprint:*", "url:*", "processed:*", "lsh:*", "dedup:index:*")
+                )
             
             # Clear in-memory cache
             self.content_hashes.clear()
             self.content_fingerprints.clear()
             self.processed_items.clear()
+            self.lsh_buckets.clear()
+            self._fingerprint_mirror.clear()
             
             logger.info("Deduplication cache cleared")
             
         except Exception as e:
             logger.error(f"Cache clear error: {e}")
+    
+    async def _unlink_redis_keys(self, patterns: Tuple[str, ...]):
+        """SCAN keys matching patterns and UNLINK them in batches"""
+        for pattern in patterns:
+            keys = []
+            async for key in self.redis_client.scan_iter(match=pattern, count=_REDIS_BATCH_SIZE):
+                keys.append(key)
+                if len(keys) >= _REDIS_BATCH_SIZE:
+                    await self.redis_client.unlink(*keys)
+                    keys = []
+            if keys:
+                await self.redis_client.unlink(*keys)
+    
+    async def close(self):
+        """Close Redis connection pools"""
+        for client in (self.redis_client, self.binary_redis_client):
+            if client is not None:
+                await client.aclose()
+        self.redis_client = None
+        self.binary_redis_client = None
 
 
 def create_deduplication_engine(config_manager: ConfigManager) -> DeduplicationEngine:
@@ -0,0 +1,100 @@
+"""
+Bounded TTL Cache
+=================
+Size-bounded in-memory cache with a fixed time-to-live per entry
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Tuple
+
+
+class TTLCache:
+    """Insertion-ordered cache that evicts expired and oldest entries in O(1)"""
+    
+    def __init__(self, maxsize: int, ttl: float,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Called for entries dropped by expiry or the size bound, not for
+        # explicit deletes or clear()
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def _expire(self, now: float) -> None:
+        """Drop expired entries from the front of the cache"""
+        # Every entry shares the same TTL and (re)insertion moves it to the
+        # end, so entries are ordered by expiry and the oldest expires first
+        data = self._data
+        while data:
+            expires_at, _ = data[next(iter(data))]
+            if expires_at > now:
+                break
+            self._evict_oldest()
+    
+    def _evict_oldest(self) -> None:
+        """Drop the oldest entry and report it to on_evict"""
+        key, (_, value) = self._data.popitem(last=False)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry or the default"""
+        self._expire(time.monotonic())
+        item = self._data.get(key)
+        return item[1] if item is not None else default
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value"""
+        item = self._data.pop(key, None)
+        return item[1] if item is not None else default
+    
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        
+        data = self._data
+        if key in data:
+            data.move_to_end(key)
+        data[key] = (now + self.ttl, value)
+        
+        # Enforce size bound by evicting the oldest entries
+        while len(data) > self.maxsize:
+            self._evict_oldest()
+    
+    def __getitem__(self, key: Hashable) -> Any:
+        self._expire(time.monotonic())
+        return self._data[key][1]
+    
+    def __delitem__(self, key: Hashable) -> None:
+        del self._data[key]
+    
+    def __contains__(self, key: Hashable) -> bool:
+        self._expire(time.monotonic())
+        return key in self._data
+    
+    def __len__(self) -> int:
+        self._expire(time.monotonic())
+        return len(self._data)
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of live (key, value) pairs, oldest first"""
+        self._expire(time.monotonic())
+        return [(key, value) for key, (_, value) in self._data.items()]
+    
+    def restore(self, entries: Iterable[Tuple[Hashable, Any, float]]) -> None:
+        """Add saved (key, value, remaining_ttl) entries, keeping their remaining lifetimes"""
+        now = time.monotonic()
+        merged = dict(self._data)
+        for key, value, remaining in entries:
+            if remaining > 0 and key not in merged:
+                merged[key] = (now + min(remaining, self.ttl), value)
+        
+        # Restored entries can expire before live ones, so re-sort by expiry
+        self._data = OrderedDict(sorted(merged.items(), key=lambda item: item[1][0]))
+        while len(self._data) > self.maxsize:
+            self._evict_oldest()
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
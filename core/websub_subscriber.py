@@ -6,23 +6,83 @@ Real-time news feed subscription system for instant content delivery
 
 import asyncio
 import hashlib
+import heapq
 import hmac
 import logging
+import os
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
-from urllib.parse import urlencode, urlparse
+from itertools import islice
+from time import mktime, monotonic
+from typing import Dict, List, Optional, Callable, Any, Tuple
+from urllib.parse import quote, urlencode, urlparse
 import xml.etree.ElementTree as ET
 
 import aiohttp
-import feedparser
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 import uvicorn
 
 from core.config_manager import ConfigManager
+from core.feed_parser import iter_feed_entries, parse_feed_entries
+from core.ttl_cache import TTLCache
+
+# aiohttp decodes brotli bodies only when one of these packages is installed
+try:
+    import brotlicffi as brotli
+except ImportError:
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
 
 logger = logging.getLogger(__name__)
 
+# Feeds are highly compressible text; aiohttp decompresses transparently
+_ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+# X-Hub-Signature algorithm prefixes accepted from hubs
+_SIGNATURE_ALGORITHMS = {
+    'sha256': hashlib.sha256,
+    'sha1': hashlib.sha1,
+}
+
+# Payloads above this size are streamed from a worker thread, in batches
+_THREADED_PARSE_BYTES = 64 * 1024
+_STREAM_BATCH_SIZE = 16
+
+# Concurrent hub/feed requests, to stay polite to shared hubs
+_MAX_CONCURRENT_REQUESTS = 10
+
+# Concurrent news item handler calls across all notifications
+_MAX_CONCURRENT_HANDLERS = 10
+
+# Requested hub lease (7 days) and how early to renew it
+_LEASE_SECONDS = 7 * 24 * 3600
+_REFRESH_MARGIN_SECONDS = 24 * 3600
+
+# Received notifications waiting for a worker; the webhook blocks when full
+_NOTIFICATION_QUEUE_SIZE = 1000
+
+# Recently dispatched (feed_id, entry id) pairs; hubs and polls resend entries
+_SEEN_ENTRIES_LIMIT = 10000
+_SEEN_ENTRIES_TTL_SECONDS = 24 * 3600
+
+# Shared read-only default for missing mapping fields
+_EMPTY: Dict = {}
+
+
+@dataclass(slots=True)
+class Subscription:
+    """Hub subscription details and verification state for one feed"""
+    topic_url: str
+    hub_url: Optional[str] = None
+    callback_url: Optional[str] = None
+    subscribed_at: Optional[datetime] = None
+    expires: Optional[datetime] = None  # Wall clock, for status reports
+    expires_at: Optional[float] = None  # monotonic() deadline, for scheduling
+    active: bool = False
+
 
 class WebSubSubscriber:
     """WebSub subscriber for real-time news feed updates"""
@@ -31,18 +91,84 @@ class WebSubSubscriber:
         self.config = config_manager
         self.websub_config = config_manager.get_websub_config()
         self.news_config = config_manager.get_news_sources_config()
+        self._hmac_secret = self.websub_config.get('verify_token', '').encode('utf-8')
+        
+        # Keyed HMAC per algorithm; each request copies one instead of re-keying
+        self._hmac_templates = {
+            algorithm: hmac.new(self._hmac_secret, digestmod=digestmod)
+            for algorithm, digestmod in _SIGNATURE_ALGORITHMS.items()
+        }
+        self._google_topics = self._build_google_topics(self.news_config.get('google_news', {}))
         
         self.app = FastAPI(title="News Bot WebSub Subscriber")
-        self.subscriptions: Dict[str, Dict] = {}
+        self.subscriptions: Dict[str, Subscription] = {}
         self.callback_handlers: List[Callable] = []
         
+        # (expires_at, feed_id) min-heap; an entry is stale once the
+        # subscription's expiry no longer matches it
+        self._expire_heap: List[Tuple[float, str]] = []
+        
+        # Cached status report, rebuilt only after subscription state changes
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_dirty = True
+        
         # Setup routes
         self.setup_routes()
         
-        # Subscription tracking
-        self.active_subscriptions = set()
-        self.subscription_expires = {}
+        # Pooled HTTP session shared by hub requests and feed polling
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._request_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        self._handler_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_HANDLERS)
+        
+        # Validators from the last 200 response per feed, for conditional GETs
+        self._feed_etags: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        
+        # Webhook notifications are parsed and dispatched by a worker pool
+        self._notify_queue: asyncio.Queue = asyncio.Queue(maxsize=_NOTIFICATION_QUEUE_SIZE)
+        self._notify_workers: List[asyncio.Task] = []
+        self._seen_entries = TTLCache(maxsize=_SEEN_ENTRIES_LIMIT, ttl=_SEEN_ENTRIES_TTL_SECONDS)
         
+    @staticmethod
+    def _build_google_topics(config: Dict) -> List[Tuple[str, str, str]]:
+        """Precompute (topic, feed_id, feed_url) for each Google News topic"""
+        base_url = config.get('base_url', 'https://news.google.com/rss/search')
+        return [
+            (
+                topic,
+                f"google_news_{topic.lower().replace(' ', '_')}",
+                f"{base_url}?q={quote(topic)}&hl=en&gl=US&ceid=US:en"
+            )
+            for topic in config.get('topics', [])
+        ]
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'NewsBot/1.0 (+https://example.com/bot)'},
+                # limit_per_host also paces bursts at one host, e.g. Google News topics
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=8,
+                    use_dns_cache=True,
+                    ttl_dns_cache=600,
+                    keepalive_timeout=60
+                )
+            )
+        return self._session
+    
+    async def close(self):
+        """Stop notification workers and close the shared HTTP session"""
+        for worker in self._notify_workers:
+            worker.cancel()
+        await asyncio.gather(*self._notify_workers, return_exceptions=True)
+        self._notify_workers.clear()
+        
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
     def setup_routes(self):
         """Setup FastAPI routes for WebSub callbacks"""
         
@@ -63,16 +189,27 @@ class WebSubSubscriber:
                 
                 if hub_mode == "subscribe":
                     logger.info(f"Subscription verified for {feed_id}: {hub_topic}")
-                    self.active_subscriptions.add(feed_id)
+                    
+                    # The hub may verify before our subscribe request has returned
+                    subscription = self.subscriptions.get(feed_id)
+                    if subscription is None:
+                        subscription = self.subscriptions[feed_id] = Subscription(topic_url=hub_topic)
+                    subscription.active = True
                     
                     # Set expiration (default 7 days)
-                    expire_time = datetime.now() + timedelta(days=7)
-                    self.subscription_expires[feed_id] = expire_time
+                    subscription.expires_at = monotonic() + _LEASE_SECONDS
+                    subscription.expires = datetime.now() + timedelta(seconds=_LEASE_SECONDS)
+                    heapq.heappush(self._expire_heap, (subscription.expires_at, feed_id))
+                    self._status_dirty = True
                     
                 elif hub_mode == "unsubscribe":
                     logger.info(f"Unsubscription verified for {feed_id}: {hub_topic}")
-                    self.active_subscriptions.discard(feed_id)
-                    self.subscription_expires.pop(feed_id, None)
+                    subscription = self.subscriptions.get(feed_id)
+                    if subscription is not None:
+                        subscription.active = False
+                        subscription.expires = None
+                        subscription.expires_at = None
+                        self._status_dirty = True
                 
                 return PlainTextResponse(hub_challenge)
                 
@@ -80,22 +217,32 @@ class WebSubSubscriber:
                 logger.error(f"WebSub verification error: {e}")
                 raise HTTPException(status_code=400, detail=str(e))
         
-        @self.app.post("/webhook/{feed_id}")
-        async def webhook_notification(feed_id: str, request: Request, background_tasks: BackgroundTasks):
+        @self.app.post("/webhook/{feed_id}", status_code=202)
+        async def webhook_notification(feed_id: str, request: Request):
             """Handle WebSub content notifications"""
             try:
-                content = await request.body()
                 content_type = request.headers.get("content-type", "")
                 
-                # Verify signature if provided
+                # Verify signature if provided, hashing the body as it streams in
                 signature = request.headers.get("x-hub-signature") or request.headers.get("x-hub-signature-256")
-                if signature:
-                    if not self._verify_signature(content, signature):
-                        logger.error(f"Invalid signature for {feed_id}")
-                        raise HTTPException(status_code=403, detail="Invalid signature")
+                verifier = self._signature_hmac(signature) if signature else None
+                if signature and verifier is None:
+                    logger.error(f"Invalid signature for {feed_id}")
+                    raise HTTPException(status_code=403, detail="Invalid signature")
+                
+                buffer = bytearray()
+                async for chunk in request.stream():
+                    buffer += chunk
+                    if verifier:
+                        verifier[0].update(chunk)
+                content = bytes(buffer)
                 
-                # Process content in background
-                background_tasks.add_task(self._process_notification, feed_id, content.decode('utf-8'))
+                if verifier and not hmac.compare_digest(verifier[1], verifier[0].hexdigest()):
+                    logger.error(f"Invalid signature for {feed_id}")
+                    raise HTTPException(status_code=403, detail="Invalid signature")
+                
+                # Hand off to the notification workers
+                await self._notify_queue.put((feed_id, content))
                 
                 logger.debug(f"Notification received for {feed_id}")
                 return {"status": "received"}
@@ -104,102 +251,125 @@ class WebSubSubscriber:
                 logger.error(f"WebSub notification error: {e}")
                 raise HTTPException(status_code=400, detail=str(e))
     
-    def _verify_signature(self, content: bytes, signature: str) -> bool:
-        """Verify WebSub signature"""
-        try:
-            # Extract algorithm and signature
-            if signature.startswith('sha256='):
-                algorithm = 'sha256'
-                provided_signature = signature[7:]
-            elif signature.startswith('sha1='):
-                algorithm = 'sha1'
-                provided_signature = signature[5:]
-            else:
-                return False
-            
-            # Calculate expected signature
-            secret = self.websub_config.get('verify_token', '').encode('utf-8')
-            if algorithm == 'sha256':
-                expected = hmac.new(secret, content, hashlib.sha256).hexdigest()
-            else:
-                expected = hmac.new(secret, content, hashlib.sha1).hexdigest()
-            
-            return hmac.compare_digest(provided_signature, expected)
-            
-        except Exception as e:
-            logger.error(f"Signature verification error: {e}")
-            return False
+    def _signature_hmac(self, signature: str) -> Optional[Tuple[Any, str]]:
+        """Start an HMAC for a WebSub signature header, with the provided digest"""
+        # Extract algorithm and signature
+        algorithm, _, provided_signature = signature.partition('=')
+        template = self._hmac_templates.get(algorithm)
+        if template is None or not provided_signature:
+            return None
+        return template.copy(), provided_signature
     
-    async def _process_notification(self, feed_id: str, content: str):
+    async def _process_notification(self, feed_id: str, content: bytes):
         """Process received notification content"""
         try:
-            # Parse RSS/Atom content
-            feed = feedparser.parse(content)
+            source_title = None
+            pending = []
+            entry_count = 0
+            
+            async for entry in self._iter_entries(content):
+                # Feed metadata is the same for every entry in a notification
+                if source_title is None:
+                    source_title = entry.get('feed', _EMPTY).get('title', feed_id)
+                news_item = self._extract_news_item(entry, feed_id, source_title)
+                
+                # Skip entries already handed to the handlers
+                if news_item['id']:
+                    seen_key = (feed_id, news_item['id'])
+                    if seen_key in self._seen_entries:
+                        continue
+                    self._seen_entries[seen_key] = True
+                entry_count += 1
+                
+                # Handlers start on early entries while later ones are parsed
+                pending.extend(
+                    asyncio.create_task(self._dispatch(handler, news_item, feed_id))
+                    for handler in self.callback_handlers
+                )
             
-            if not feed.entries:
+            if not entry_count:
                 logger.debug(f"No new entries in notification for {feed_id}")
                 return
             
-            logger.info(f"Processing {len(feed.entries)} new entries from {feed_id}")
-            
-            # Process each entry
-            for entry in feed.entries:
-                news_item = self._extract_news_item(entry, feed_id)
-                
-                # Notify all registered handlers
-                for handler in self.callback_handlers:
-                    try:
-                        await handler(news_item)
-                    except Exception as e:
-                        logger.error(f"Handler error for {feed_id}: {e}")
+            logger.info(f"Processing {entry_count} new entries from {feed_id}")
+            await asyncio.gather(*pending)
                         
         except Exception as e:
             logger.error(f"Content processing error for {feed_id}: {e}")
     
-    def _extract_news_item(self, entry, feed_id: str) -> Dict[str, Any]:
+    async def _iter_entries(self, content: bytes):
+        """Yield feed entries, streaming large payloads from a worker thread"""
+        # Raw bytes let the parser honour the document's declared encoding
+        if len(content) <= _THREADED_PARSE_BYTES:
+            for entry in parse_feed_entries(content):
+                yield entry
+            return
+        
+        entries = iter_feed_entries(content)
+        while batch := await asyncio.to_thread(list, islice(entries, _STREAM_BATCH_SIZE)):
+            for entry in batch:
+                yield entry
+    
+    async def _notification_worker(self):
+        """Process queued webhook notifications"""
+        while True:
+            feed_id, content = await self._notify_queue.get()
+            try:
+                await self._process_notification(feed_id, content)
+            finally:
+                self._notify_queue.task_done()
+    
+    async def _dispatch(self, handler: Callable, news_item: Dict[str, Any], feed_id: str):
+        """Run one handler for one news item"""
+        async with self._handler_semaphore:
+            try:
+                await handler(news_item)
+            except Exception as e:
+                logger.error(f"Handler error for {feed_id}: {e}")
+    
+    def _extract_news_item(self, entry, feed_id: str, source_title: Optional[str] = None) -> Dict[str, Any]:
         """Extract news item from feed entry"""
+        if source_title is None:
+            source_title = entry.get('feed', _EMPTY).get('title', feed_id)
+        
         # Get published time
-        published = None
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            from time import mktime
-            published = datetime.fromtimestamp(mktime(entry.published_parsed))
-        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-            from time import mktime
-            published = datetime.fromtimestamp(mktime(entry.updated_parsed))
+        published_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if published_parsed:
+            published = datetime.fromtimestamp(mktime(published_parsed))
         else:
             published = datetime.now()
         
         # Extract image if available
         image_url = None
-        if hasattr(entry, 'media_content') and entry.media_content:
-            image_url = entry.media_content[0].get('url')
-        elif hasattr(entry, 'enclosures') and entry.enclosures:
-            for enclosure in entry.enclosures:
-                if enclosure.type.startswith('image/'):
-                    image_url = enclosure.href
+        media_content = entry.get('media_content')
+        if media_content:
+            image_url = media_content[0].get('url')
+        else:
+            for enclosure in entry.get('enclosures') or ():
+                if enclosure.get('type', '').startswith('image/'):
+                    image_url = enclosure.get('href')
                     break
         
         # Extract content
-        content = ""
-        if hasattr(entry, 'content') and entry.content:
-            content = entry.content[0].value
-        elif hasattr(entry, 'summary'):
-            content = entry.summary
-        elif hasattr(entry, 'description'):
-            content = entry.description
+        summary = entry.get('summary', '')
+        entry_content = entry.get('content')
+        if entry_content:
+            content = entry_content[0].get('value', '')
+        else:
+            content = summary
         
         return {
-            'id': getattr(entry, 'id', entry.link),
-            'title': getattr(entry, 'title', ''),
-            'link': getattr(entry, 'link', ''),
+            'id': entry.get('id') or entry.get('link', ''),
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
             'content': content,
-            'summary': getattr(entry, 'summary', ''),
+            'summary': summary,
             'published': published,
-            'author': getattr(entry, 'author', ''),
-            'tags': [tag.term for tag in getattr(entry, 'tags', [])],
+            'author': entry.get('author', ''),
+            'tags': [tag.get('term') for tag in entry.get('tags') or ()],
             'image_url': image_url,
             'source': feed_id,
-            'source_title': getattr(entry, 'feed', {}).get('title', feed_id)
+            'source_title': source_title
         }
     
     def add_callback_handler(self, handler: Callable):
@@ -210,28 +380,33 @@ class WebSubSubscriber:
     async def subscribe_to_feeds(self):
         """Subscribe to all configured news feeds"""
         try:
+            subscriptions = []
+            
             # Subscribe to Google News topics
             google_config = self.news_config.get('google_news', {})
             if google_config.get('enabled'):
-                await self._subscribe_google_news(google_config)
+                subscriptions.append(self._subscribe_google_news(google_config))
             
             # Subscribe to TechCrunch
             techcrunch_config = self.news_config.get('techcrunch', {})
             if techcrunch_config.get('enabled'):
-                await self._subscribe_to_feed(
+                subscriptions.append(self._subscribe_to_feed(
                     'techcrunch',
                     techcrunch_config['rss_url'],
                     techcrunch_config['websub_hub']
-                )
+                ))
             
             # Subscribe to additional sources
             additional_sources = self.news_config.get('additional_sources', [])
             for source in additional_sources:
-                await self._subscribe_to_feed(
+                subscriptions.append(self._subscribe_to_feed(
                     source['name'].lower().replace(' ', '_'),
                     source['rss_url'],
                     source['websub_hub']
-                )
+                ))
+            
+            # Concurrency is capped by the shared request semaphore
+            await asyncio.gather(*subscriptions, return_exceptions=True)
                 
             logger.info(f"WebSub subscriptions initiated for {len(self.subscriptions)} feeds")
             
@@ -241,15 +416,14 @@ class WebSubSubscriber:
     
     async def _subscribe_google_news(self, config: Dict):
         """Subscribe to Google News topic feeds"""
-        base_url = config.get('base_url', 'https://news.google.com/rss/search')
         hub_url = config.get('websub_hub', 'https://pubsubhubbub.appspot.com/')
-        topics = config.get('topics', [])
         
-        for topic in topics:
-            feed_id = f"google_news_{topic.lower().replace(' ', '_')}"
-            topic_url = f"{base_url}?q={topic.replace(' ', '%20')}&hl=en&gl=US&ceid=US:en"
-            
-            await self._subscribe_to_feed(feed_id, topic_url, hub_url)
+        subscriptions = [
+            self._subscribe_to_feed(feed_id, topic_url, hub_url)
+            for _, feed_id, topic_url in self._google_topics
+        ]
+        
+        await asyncio.gather(*subscriptions, return_exceptions=True)
     
     async def _subscribe_to_feed(self, feed_id: str, topic_url: str, hub_url: str):
         """Subscribe to a specific feed"""
@@ -263,21 +437,27 @@ class WebSubSubscriber:
                 'hub.topic': topic_url,
                 'hub.verify': 'async',
                 'hub.verify_token': verify_token,
-                'hub.lease_seconds': '604800'  # 7 days
+                'hub.lease_seconds': str(_LEASE_SECONDS)
             }
             
-            async with aiohttp.ClientSession() as session:
+            session = self._get_session()
+            async with self._request_semaphore:
                 async with session.post(hub_url, data=subscription_data) as response:
-                    if response.status in [202, 204]:
-                        self.subscriptions[feed_id] = {
-                            'topic_url': topic_url,
-                            'hub_url': hub_url,
-                            'callback_url': callback_url,
-                            'subscribed_at': datetime.now()
-                        }
-                        logger.info(f"Subscription request sent for {feed_id}")
-                    else:
-                        logger.error(f"Subscription failed for {feed_id}: {response.status}")
+                    status = response.status
+            
+            if status in [202, 204]:
+                # Keep verification state if the hub already called back
+                subscription = self.subscriptions.get(feed_id)
+                if subscription is None:
+                    subscription = self.subscriptions[feed_id] = Subscription(topic_url=topic_url)
+                subscription.topic_url = topic_url
+                subscription.hub_url = hub_url
+                subscription.callback_url = callback_url
+                subscription.subscribed_at = datetime.now()
+                self._status_dirty = True
+                logger.info(f"Subscription request sent for {feed_id}")
+            else:
+                logger.error(f"Subscription failed for {feed_id}: {status}")
                         
         except Exception as e:
             logger.error(f"Subscription error for {feed_id}: {e}")
@@ -290,9 +470,9 @@ class WebSubSubscriber:
                 return
                 
             subscription = self.subscriptions[feed_id]
-            callback_url = subscription['callback_url']
-            topic_url = subscription['topic_url']
-            hub_url = subscription['hub_url']
+            callback_url = subscription.callback_url
+            topic_url = subscription.topic_url
+            hub_url = subscription.hub_url
             verify_token = self.websub_config.get('verify_token', 'default_token')
             
             unsubscription_data = {
@@ -303,12 +483,12 @@ class WebSubSubscriber:
                 'hub.verify_token': verify_token
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(hub_url, data=unsubscription_data) as response:
-                    if response.status in [202, 204]:
-                        logger.info(f"Unsubscription request sent for {feed_id}")
-                    else:
-                        logger.error(f"Unsubscription failed for {feed_id}: {response.status}")
+            session = self._get_session()
+            async with session.post(hub_url, data=unsubscription_data) as response:
+                if response.status in [202, 204]:
+                    logger.info(f"Unsubscription request sent for {feed_id}")
+                else:
+                    logger.error(f"Unsubscription failed for {feed_id}: {response.status}")
                         
         except Exception as e:
             logger.error(f"Unsubscription error for {feed_id}: {e}")
@@ -316,18 +496,27 @@ class WebSubSubscriber:
     async def refresh_subscriptions(self):
         """Refresh expiring subscriptions"""
         try:
-            current_time = datetime.now()
+            refresh_before = monotonic() + _REFRESH_MARGIN_SECONDS
             
-            for feed_id, expire_time in list(self.subscription_expires.items()):
-                # Refresh if expiring within 24 hours
-                if expire_time - current_time < timedelta(hours=24):
-                    subscription = self.subscriptions.get(feed_id)
-                    if subscription:
-                        await self._subscribe_to_feed(
-                            feed_id,
-                            subscription['topic_url'],
-                            subscription['hub_url']
-                        )
+            # Pop subscriptions expiring within 24 hours
+            due = []
+            while self._expire_heap and self._expire_heap[0][0] < refresh_before:
+                expires_at, feed_id = heapq.heappop(self._expire_heap)
+                subscription = self.subscriptions.get(feed_id)
+                if subscription is None or subscription.expires_at != expires_at:
+                    continue
+                due.append((expires_at, feed_id, subscription))
+            
+            for expires_at, feed_id, subscription in due:
+                if subscription.hub_url is not None:
+                    await self._subscribe_to_feed(
+                        feed_id,
+                        subscription.topic_url,
+                        subscription.hub_url
+                    )
+                
+                # Retried each check until the hub re-verifies with a new expiry
+                heapq.heappush(self._expire_heap, (expires_at, feed_id))
                         
             logger.info("Subscription refresh check completed")
             
@@ -336,18 +525,38 @@ class WebSubSubscriber:
     
     def get_subscription_status(self) -> Dict[str, Any]:
         """Get status of all subscriptions"""
+        if self._status_dirty or self._status_cache is None:
+            self._build_status()
+        
+        # Copies down to the per-subscription dicts, so callers can't corrupt the cache
+        status = self._status_cache
         return {
-            'active_subscriptions': len(self.active_subscriptions),
+            **status,
+            'subscriptions': {feed_id: dict(details) for feed_id, details in status['subscriptions'].items()}
+        }
+    
+    def _build_status(self):
+        """Rebuild the cached subscription status report"""
+        self._status_cache = {
+            'active_subscriptions': self._active_count(),
             'total_subscriptions': len(self.subscriptions),
             'subscriptions': {
                 feed_id: {
-                    'active': feed_id in self.active_subscriptions,
-                    'expires': self.subscription_expires.get(feed_id),
-                    **details
+                    'active': subscription.active,
+                    'expires': subscription.expires,
+                    'topic_url': subscription.topic_url,
+                    'hub_url': subscription.hub_url,
+                    'callback_url': subscription.callback_url,
+                    'subscribed_at': subscription.subscribed_at
                 }
-                for feed_id, details in self.subscriptions.items()
+                for feed_id, subscription in self.subscriptions.items()
             }
         }
+        self._status_dirty = False
+    
+    def _active_count(self) -> int:
+        """Number of hub-verified subscriptions"""
+        return sum(1 for subscription in self.subscriptions.values() if subscription.active)
     
     async def start_server(self):
         """Start the WebSub server"""
@@ -357,11 +566,21 @@ class WebSubSubscriber:
             
             logger.info(f"Starting WebSub server on {host}:{port}")
             
+            if not self._notify_workers:
+                self._notify_workers = [
+                    asyncio.create_task(self._notification_worker())
+                    for _ in range(os.cpu_count() or 1)
+                ]
+            
+            # Runs on the bot's event loop (uvloop when installed, see main.py);
+            # http="auto" already selects httptools when it is available
             config = uvicorn.Config(
                 app=self.app,
                 host=host,
                 port=port,
-                log_level="info"
+                log_level="info",
+                access_log=False,
+                backlog=2048
             )
             
             server = uvicorn.Server(config)
@@ -381,14 +600,14 @@ class WebSubSubscriber:
             while True:
                 feeds_to_poll = 0
                 
-                for feed_id, subscription in self.subscriptions.items():
-                    if feed_id not in self.active_subscriptions:
+                for feed_id, subscription in list(self.subscriptions.items()):
+                    if not subscription.active:
                         # Poll this feed since WebSub isn't working
-                        await self._poll_feed(feed_id, subscription['topic_url'])
+                        await self._poll_feed(feed_id, subscription.topic_url)
                         feeds_to_poll += 1
                 
                 # If we have no active WebSub subscriptions, poll all configured feeds
-                if len(self.active_subscriptions) == 0:
+                if self._active_count() == 0:
                     logger.info("No active WebSub subscriptions - activating RSS polling fallback")
                     await self._poll_all_configured_feeds()
                 
@@ -405,16 +624,34 @@ class WebSubSubscriber:
     async def _poll_feed(self, feed_id: str, feed_url: str):
         """Poll a single feed for updates"""
         try:
-            headers = {'User-Agent': 'NewsBot/1.0 (+https://example.com/bot)'}
-            timeout = aiohttp.ClientTimeout(total=30)
+            headers = {'Accept-Encoding': _ACCEPT_ENCODING}
+            etag, last_modified = self._feed_etags.get(feed_id, (None, None))
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            
+            session = self._get_session()
+            async with self._request_semaphore:
+                async with session.get(feed_url, headers=headers) as response:
+                    status = response.status
+                    content = None
+                    if status == 200:
+                        content = await response.read()
+                        self._feed_etags[feed_id] = (
+                            response.headers.get('ETag'),
+                            response.headers.get('Last-Modified')
+                        )
             
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                async with session.get(feed_url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        await self._process_notification(feed_id, content)
-                    else:
-                        logger.warning(f"Feed polling failed for {feed_id}: HTTP {response.status}")
+            if status == 304:
+                logger.debug(f"Feed unchanged for {feed_id}")
+                return
+            
+            # Entries are processed after releasing the request slot
+            if content is not None:
+                await self._process_notification(feed_id, content)
+            else:
+                logger.warning(f"Feed polling failed for {feed_id}: HTTP {status}")
                         
         except Exception as e:
             logger.error(f"Feed polling error for {feed_id}: {e}")
@@ -423,32 +660,28 @@ class WebSubSubscriber:
         """Poll all configured feeds as fallback when WebSub fails"""
         try:
             logger.info("🔄 RSS fallback polling activated - ensuring bulletproof operation")
-            feeds_polled = 0
+            polls = []
             
             # Poll Google News topics directly
             google_config = self.news_config.get('google_news', {})
             if google_config.get('enabled'):
-                base_url = google_config.get('base_url', 'https://news.google.com/rss/search')
-                topics = google_config.get('topics', [])[:5]  # Limit to first 5 topics to avoid rate limits
+                topics = self._google_topics[:5]  # Limit to first 5 topics to avoid rate limits
                 
-                for topic in topics:
-                    feed_id = f"google_news_{topic.lower().replace(' ', '_')}"
-                    topic_url = f"{base_url}?q={topic.replace(' ', '%20')}&hl=en&gl=US&ceid=US:en"
+                for topic, feed_id, topic_url in topics:
                     logger.info(f"📡 Polling RSS feed: {topic}")
-                    await self._poll_feed(feed_id, topic_url)
-                    feeds_polled += 1
-                    await asyncio.sleep(2)  # Small delay between requests
+                    polls.append(self._poll_feed(feed_id, topic_url))
                     
             # Poll other configured sources
             additional_sources = self.news_config.get('additional_sources', [])[:3]  # Limit sources
             for source in additional_sources:
                 feed_id = source['name'].lower().replace(' ', '_')
                 logger.info(f"📡 Polling RSS feed: {source['name']}")
-                await self._poll_feed(feed_id, source['rss_url'])
-                feeds_polled += 1
-                await asyncio.sleep(2)
+                polls.append(self._poll_feed(feed_id, source['rss_url']))
+            
+            # Concurrency is capped by the shared request semaphore
+            await asyncio.gather(*polls, return_exceptions=True)
             
-            logger.info(f"✅ RSS polling completed - {feeds_polled} feeds processed (bulletproof system active)")
+            logger.info(f"✅ RSS polling completed - {len(polls)} feeds processed (bulletproof system active)")
                 
         except Exception as e:
             logger.error(f"RSS fallback polling error: {e}")
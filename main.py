@@ -5,23 +5,34 @@ Orchestrates all components for comprehensive news automation
 """
 
 import asyncio
+import hashlib
 import logging
 import sys
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional
+import time
 
-# Add core directory to path
-sys.path.append('.')
+import aiofiles
+import aiohttp
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
 
 from core.config_manager import ConfigManager
 from core.websub_subscriber import create_websub_subscriber
 from core.ai_processor import create_ai_processor
 from core.deduplication_engine import create_deduplication_engine
+from core.ttl_cache import TTLCache
+from social.browser_pool import BROWSER_POOL
 from social.twitter_bot import create_twitter_bot
 from social.facebook_poster import create_facebook_poster
 from social.telegram_poster import create_telegram_poster
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +45,77 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Items that passed the inline exact check, waiting for the full pipeline.
+# One worker per AI batch slot, so concurrent items fill a batched call
+_PIPELINE_QUEUE_SIZE = 1000
+_PIPELINE_WORKERS = 8
+
+# Maintenance cadence, and how many new items trigger a cache clear
+_MAINTENANCE_INTERVAL_SECONDS = 3600
+_CACHE_CLEAR_ITEMS = 1000
+
+# Exact (link or title) keys seen at ingest
+_INGEST_KEYS_LIMIT = 100000
+_INGEST_KEYS_TTL_SECONDS = 24 * 3600
+
+# Generated post text per (title, link, platform), so replayed items
+# skip regeneration
+_POST_TEXT_CACHE_LIMIT = 1024
+_POST_TEXT_CACHE_TTL_SECONDS = 24 * 3600
+
+# Recently downloaded images, hardlinked into each item's temp file
+_IMAGE_CACHE_DIR = os.path.join('temp_images', 'cache')
+_IMAGE_CACHE_LIMIT = 128
+_IMAGE_CACHE_TTL_SECONDS = 6 * 3600
+
+# Feed image URLs are untrusted; larger bodies are refused or abandoned
+_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+_IMAGE_REQUEST_HEADERS = {'Accept': 'image/*'}
+
+
+@dataclass(frozen=True, slots=True)
+class SocialPayload:
+    """Platform-neutral post content, built once per news item"""
+    title: str
+    body: str
+    link: str
+    image_path: Optional[str]
+    text: str  # Formatted post shared by every platform
+
+
+def build_social_payload(news_item: Dict[str, Any], image_path: Optional[str]) -> SocialPayload:
+    """Build the shared social post for a news item"""
+    title = news_item.get('title', '')
+    content = news_item.get('enhanced_content') or news_item.get('content', '') or news_item.get('summary', '')
+    body = content[:200]
+    link = news_item.get('link', '')
+    return SocialPayload(title, body, link, image_path, f"{title}\n\n{body}...\n\n{link}")
+
+
+def _post_text_key(payload: SocialPayload, platform: str) -> bytes:
+    """Compact cache key for a post's generated text (BLAKE2b, 128-bit digest)"""
+    return hashlib.blake2b(
+        f"{payload.title}\x00{payload.link}\x00{platform}".encode('utf-8'),
+        digest_size=16
+    ).digest()
+
+
+def _replace_link(source: str, target: str) -> None:
+    """Hardlink source to target, replacing any existing target"""
+    try:
+        os.remove(target)
+    except FileNotFoundError:
+        pass
+    os.link(source, target)
+
+
+def _remove_cached_image(key: bytes, path: str) -> None:
+    """Delete an image evicted from the download cache"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
 
 class NewsAutomationBot:
     """Main orchestrator for the news automation system"""
@@ -47,6 +129,31 @@ class NewsAutomationBot:
         self.facebook_poster = None
         self.telegram_poster = None
         
+        # Pooled session for image downloads
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # Created once here rather than on every download
+        os.makedirs(_IMAGE_CACHE_DIR, exist_ok=True)
+        
+        # sha1(image URL) -> cached copy, so syndicated images download once
+        self._image_cache = TTLCache(
+            maxsize=_IMAGE_CACHE_LIMIT,
+            ttl=_IMAGE_CACHE_TTL_SECONDS,
+            on_evict=_remove_cached_image
+        )
+        
+        # Copies left by an earlier run aren't in the new cache
+        self._prune_image_cache()
+        
+        # Ingest only does an O(1) exact check; similarity dedup, AI and
+        # posting run in pipeline workers off the callback path
+        self._ingest_keys = TTLCache(maxsize=_INGEST_KEYS_LIMIT, ttl=_INGEST_KEYS_TTL_SECONDS)
+        self._pipeline_queue: asyncio.Queue = asyncio.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+        self._background_tasks = []
+        
+        # Generated post text survives AI cache clears, for replayed items
+        self._post_text_cache = TTLCache(maxsize=_POST_TEXT_CACHE_LIMIT, ttl=_POST_TEXT_CACHE_TTL_SECONDS)
+        
         # System state
         self.running = False
         self.emergency_stop = False
@@ -59,6 +166,8 @@ class NewsAutomationBot:
             'errors': 0,
             'start_time': None
         }
+        self._start_monotonic: Optional[float] = None
+        self._items_at_cache_clear = 0
     
     async def initialize(self) -> bool:
         """Initialize all components"""
@@ -106,12 +215,13 @@ class NewsAutomationBot:
             logger.info("Subscribed to news feeds")
             
             self.stats['start_time'] = datetime.now()
+            self._start_monotonic = time.monotonic()
             logger.info("News Automation Bot initialized successfully!")
             
             return True
             
         except Exception as e:
-            logger.error(f"Initialization error: {e}")
+            logger.error("Initialization error: %s", e)
             return False
     
     async def process_news_item(self, news_item: Dict[str, Any]) -> None:
@@ -121,9 +231,42 @@ class NewsAutomationBot:
                 logger.warning("Emergency stop active - skipping news item")
                 return
             
-            logger.info(f"Processing news: {news_item.get('title', '')[:50]}...")
             self.stats['items_processed'] += 1
             
+            # Exact repeat of an item already queued or processed
+            identity = (news_item.get('link') or news_item.get('title') or '').strip()
+            if identity:
+                ingest_key = hashlib.sha1(identity.encode('utf-8')).digest()
+                if ingest_key in self._ingest_keys:
+                    logger.debug("Duplicate filtered at ingest: exact link/title")
+                    self.stats['duplicates_filtered'] += 1
+                    return
+                self._ingest_keys[ingest_key] = True
+            
+            await self._pipeline_queue.put(news_item)
+            
+        except Exception as e:
+            logger.error("News processing error: %s", e)
+            self.stats['errors'] += 1
+    
+    async def _pipeline_worker(self) -> None:
+        """Run queued news items through dedup, AI and posting"""
+        while True:
+            news_item = await self._pipeline_queue.get()
+            try:
+                await self._process_queued_item(news_item)
+            finally:
+                self._pipeline_queue.task_done()
+    
+    async def _process_queued_item(self, news_item: Dict[str, Any]) -> None:
+        """Check a queued news item for near-duplicates, enhance and post it"""
+        try:
+            if self.emergency_stop:
+                logger.warning("Emergency stop active - skipping news item")
+                return
+            
+            logger.info("Processing news: %.50s...", news_item.get('title', ''))
+            
             # Check for duplicates
             is_duplicate, reason, similarity = await self.dedup_engine.is_duplicate(
                 news_item.get('content', ''),
@@ -132,7 +275,7 @@ class NewsAutomationBot:
             )
             
             if is_duplicate:
-                logger.debug(f"Duplicate filtered: {reason} (similarity: {similarity:.2f})")
+                logger.debug("Duplicate filtered: %s (similarity: %.2f)", reason, similarity)
                 self.stats['duplicates_filtered'] += 1
                 return
             
@@ -144,7 +287,7 @@ class NewsAutomationBot:
             # Skip low-quality content
             quality_threshold = self.config_manager.get_content_config().get('quality_threshold', 0.7)
             if content_analysis.get('quality_score', 0) < quality_threshold:
-                logger.debug(f"Low quality content filtered: {content_analysis.get('quality_score', 0)}")
+                logger.debug("Low quality content filtered: %s", content_analysis.get('quality_score', 0))
                 return
             
             # Skip negative sentiment content (optional)
@@ -165,15 +308,12 @@ class NewsAutomationBot:
             await self.post_to_platforms(news_item)
             
         except Exception as e:
-            logger.error(f"News processing error: {e}")
+            logger.error("News processing error: %s", e)
             self.stats['errors'] += 1
     
     async def post_to_platforms(self, news_item: Dict[str, Any]) -> None:
         """Post news item to all configured platforms"""
         try:
-            title = news_item.get('title', '')
-            content = news_item.get('enhanced_content') or news_item.get('content', '') or news_item.get('summary', '')
-            link = news_item.get('link', '')
             image_url = news_item.get('image_url')
             
             # Download image if available
@@ -182,73 +322,99 @@ class NewsAutomationBot:
                 image_path = await self.download_image(image_url, news_item.get('id', 'unknown'))
             
             # Prepare content for social media
-            social_content = f"{title}\n\n{content[:200]}...\n\n{link}"
-            
-            # Track posting success
-            posted_successfully = False
+            payload = build_social_payload(news_item, image_path)
             
-            # Post to Twitter
+            # Check each platform's daily limit once for this item
+            posts = []
             if self.config_manager.can_post_to_platform('twitter'):
-                try:
-                    # Generate Twitter-specific content
-                    twitter_content = await self.ai_processor.generate_social_post(
-                        social_content, 'twitter', news_item.get('source', '')
-                    )
-                    
-                    if twitter_content:
-                        # Check if content needs threading
-                        char_limit = self.config_manager.get_twitter_config().get('limits', {}).get('character_limit', 280)
-                        
-                        if len(twitter_content) > char_limit and self.config_manager.get_twitter_config().get('limits', {}).get('thread_enabled', True):
-                            # Create thread
-                            thread_content = await self.ai_processor.create_thread_content(twitter_content, 'twitter')
-                            if await self.ensure_twitter_ready() and await self.twitter_bot.post_thread(thread_content, [image_path] if image_path else None):
-                                posted_successfully = True
-                                logger.info("Posted Twitter thread")
-                        else:
-                            # Single tweet
-                            if await self.ensure_twitter_ready() and await self.twitter_bot.post_tweet(twitter_content, image_path):
-                                posted_successfully = True
-                                logger.info("Posted to Twitter")
-                
-                except Exception as e:
-                    logger.error(f"Twitter posting error: {e}")
-            
-            # Post to Facebook
+                posts.append(self._post_to_twitter(payload, news_item.get('source', '')))
             if self.config_manager.can_post_to_platform('facebook'):
-                try:
-                    if await self.facebook_poster.post_content(social_content, image_path):
-                        posted_successfully = True
-                        logger.info("Posted to Facebook")
-                        
-                except Exception as e:
-                    logger.error(f"Facebook posting error: {e}")
-            
-            # Post to Telegram
+                posts.append(self._post_to_facebook(payload))
             if self.config_manager.can_post_to_platform('telegram'):
-                try:
-                    if await self.telegram_poster.post_content(social_content, image_path):
-                        posted_successfully = True
-                        logger.info("Posted to Telegram")
-                        
-                except Exception as e:
-                    logger.error(f"Telegram posting error: {e}")
-            
-            if posted_successfully:
+                posts.append(self._post_to_telegram(payload))
+            
+            try:
+                # Platforms are independent, so post to all of them at once
+                results = await asyncio.gather(*posts, return_exceptions=True)
+            finally:
+                # Clean up downloaded image once every platform is done with it
+                if image_path:
+                    try:
+                        await asyncio.to_thread(os.remove, image_path)
+                    except OSError:
+                        pass
+            
+            if any(result is True for result in results):
                 self.stats['items_posted'] += 1
                 logger.info("News item posted successfully to platforms")
             
-            # Clean up downloaded image
-            if image_path and os.path.exists(image_path):
-                try:
-                    os.remove(image_path)
-                except:
-                    pass
-            
         except Exception as e:
-            logger.error(f"Platform posting error: {e}")
+            logger.error("Platform posting error: %s", e)
             self.stats['errors'] += 1
     
+    async def _post_to_twitter(self, payload: SocialPayload, source: str) -> bool:
+        """Post news item to Twitter as a tweet or thread"""
+        try:
+            image_path = payload.image_path
+            
+            # Generate Twitter-specific content, reusing text made for a replayed item
+            cache_key = _post_text_key(payload, 'twitter')
+            twitter_content = self._post_text_cache.get(cache_key)
+            if twitter_content is None:
+                twitter_content, final = await self.ai_processor.generate_social_post_with_status(
+                    payload.text, 'twitter', source
+                )
+                # Only final text is cached, so replaying a fallback post retries the AI
+                if twitter_content and final:
+                    self._post_text_cache[cache_key] = twitter_content
+            
+            if twitter_content:
+                # Check if content needs threading (the section is cached and
+                # swapped on reload, so this stays current)
+                twitter_limits = self.config_manager.get_twitter_config().get('limits', {})
+                char_limit = twitter_limits.get('character_limit', 280)
+                
+                if len(twitter_content) > char_limit and twitter_limits.get('thread_enabled', True):
+                    # Create thread
+                    thread_content = await self.ai_processor.create_thread_content(twitter_content, 'twitter')
+                    if await self.ensure_twitter_ready() and await self.twitter_bot.post_thread(thread_content, [image_path] if image_path else None):
+                        logger.info("Posted Twitter thread")
+                        return True
+                else:
+                    # Single tweet
+                    if await self.ensure_twitter_ready() and await self.twitter_bot.post_tweet(twitter_content, image_path):
+                        logger.info("Posted to Twitter")
+                        return True
+        
+        except Exception as e:
+            logger.error("Twitter posting error: %s", e)
+        
+        return False
+    
+    async def _post_to_facebook(self, payload: SocialPayload) -> bool:
+        """Post news item to the Facebook page"""
+        try:
+            if await self.facebook_poster.post_content(payload.text, payload.image_path):
+                logger.info("Posted to Facebook")
+                return True
+                
+        except Exception as e:
+            logger.error("Facebook posting error: %s", e)
+        
+        return False
+    
+    async def _post_to_telegram(self, payload: SocialPayload) -> bool:
+        """Post news item to the Telegram channel"""
+        try:
+            if await self.telegram_poster.post_content(payload.text, payload.image_path):
+                logger.info("Posted to Telegram")
+                return True
+                
+        except Exception as e:
+            logger.error("Telegram posting error: %s", e)
+        
+        return False
+    
     async def ensure_twitter_ready(self) -> bool:
         """Ensure Twitter bot is ready for posting"""
         try:
@@ -256,37 +422,75 @@ class NewsAutomationBot:
                 return await self.twitter_bot.initialize()
             return True
         except Exception as e:
-            logger.error(f"Twitter initialization error: {e}")
+            logger.error("Twitter initialization error: %s", e)
             return False
     
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the shared image download session, creating it on first use"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._http_session
+    
     async def download_image(self, image_url: str, item_id: str) -> Optional[str]:
         """Download image for posting"""
         try:
-            import aiohttp
-            import aiofiles
-            
-            # Create temp directory
-            os.makedirs('temp_images', exist_ok=True)
-            
             # Generate filename
-            extension = image_url.split('.')[-1].split('?')[0] or 'jpg'
+            extension = os.path.splitext(urlsplit(image_url).path)[1].lstrip('.')
+            if not extension or len(extension) > 5 or not extension.isalnum():
+                extension = 'jpg'
             filename = f"temp_images/{item_id}.{extension}"
             
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(image_url) as response:
-                    if response.status == 200:
-                        async with aiofiles.open(filename, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                await f.write(chunk)
-                        
-                        logger.debug(f"Image downloaded: {filename}")
-                        return filename
+            # Reuse a recent download of the same URL
+            key = hashlib.sha1(image_url.encode('utf-8')).digest()
+            cached_path = self._image_cache.get(key)
+            if cached_path:
+                try:
+                    await asyncio.to_thread(_replace_link, cached_path, filename)
+                    logger.debug("Image reused from cache: %s", filename)
+                    return filename
+                except OSError:
+                    self._image_cache.pop(key)
+            
+            session = self._get_http_session()
+            async with session.get(image_url, headers=_IMAGE_REQUEST_HEADERS) as response:
+                if response.status == 200:
+                    # Refuse declared oversized bodies before reading anything
+                    if response.content_length and response.content_length > _MAX_IMAGE_BYTES:
+                        logger.warning("Image too large (%d bytes): %s", response.content_length, image_url)
+                        return None
+                    
+                    total = 0
+                    async with aiofiles.open(filename, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(8192):
+                            total += len(chunk)
+                            if total > _MAX_IMAGE_BYTES:
+                                break
+                            await f.write(chunk)
+                    
+                    # Undeclared or understated length ran past the cap
+                    if total > _MAX_IMAGE_BYTES:
+                        await asyncio.to_thread(os.remove, filename)
+                        logger.warning("Image exceeded %d bytes: %s", _MAX_IMAGE_BYTES, image_url)
+                        return None
+                    
+                    # Keep a linked copy that outlives the item's temp file
+                    cached_path = os.path.join(_IMAGE_CACHE_DIR, f"{key.hex()}.{extension}")
+                    try:
+                        await asyncio.to_thread(_replace_link, filename, cached_path)
+                        self._image_cache[key] = cached_path
+                    except OSError as e:
+                        logger.warning("Image cache error: %s", e)
+                    
+                    logger.debug("Image downloaded: %s", filename)
+                    return filename
             
             return None
             
         except Exception as e:
-            logger.error(f"Image download error: {e}")
+            logger.error("Image download error: %s", e)
             return None
     
     async def run_engagement_cycle(self) -> None:
@@ -302,7 +506,7 @@ class NewsAutomationBot:
                 logger.info("Engagement cycle completed")
             
         except Exception as e:
-            logger.error(f"Engagement cycle error: {e}")
+            logger.error("Engagement cycle error: %s", e)
     
     async def run_maintenance_tasks(self) -> None:
         """Run periodic maintenance tasks"""
@@ -312,22 +516,51 @@ class NewsAutomationBot:
             # Refresh WebSub subscriptions
             await self.websub_subscriber.refresh_subscriptions()
             
-            # Clear caches if needed
-            if self.stats['items_processed'] % 1000 == 0:
+            # Close browser contexts no bot has used for a while
+            await BROWSER_POOL.cleanup_idle()
+            
+            # Expire idle image cache entries and drop untracked copies
+            self._prune_image_cache()
+            
+            # Clear caches once enough new items have gone through
+            if self.stats['items_processed'] - self._items_at_cache_clear >= _CACHE_CLEAR_ITEMS:
                 self.ai_processor.clear_cache()
                 await self.dedup_engine.clear_cache()
+                self._items_at_cache_clear = self.stats['items_processed']
                 logger.info("Caches cleared")
             
-            # Check for daily limit reset
-            current_time = datetime.now()
-            if current_time.hour == 0 and current_time.minute < 5:  # Around midnight
-                self.config_manager.reset_daily_limits()
-                logger.info("Daily limits reset")
-            
             logger.info("Maintenance tasks completed")
             
         except Exception as e:
-            logger.error(f"Maintenance task error: {e}")
+            logger.error("Maintenance task error: %s", e)
+    
+    def _prune_image_cache(self) -> None:
+        """Delete cached image files that no live cache entry points to"""
+        # items() also expires stale entries, deleting their files via on_evict
+        live = {path for _, path in self._image_cache.items()}
+        try:
+            with os.scandir(_IMAGE_CACHE_DIR) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.path not in live:
+                        os.remove(entry.path)
+        except OSError as e:
+            logger.warning("Image cache prune error: %s", e)
+    
+    async def _maintenance_loop(self) -> None:
+        """Run maintenance tasks on a fixed interval"""
+        while self.running:
+            await asyncio.sleep(_MAINTENANCE_INTERVAL_SECONDS)
+            await self.run_maintenance_tasks()
+    
+    async def _daily_reset_loop(self) -> None:
+        """Reset daily platform limits at each local midnight"""
+        while self.running:
+            now = datetime.now()
+            next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            await asyncio.sleep((next_midnight - now).total_seconds())
+            
+            self.config_manager.reset_daily_limits()
+            logger.info("Daily limits reset")
     
     async def run(self) -> None:
         """Run the main application loop"""
@@ -335,46 +568,81 @@ class NewsAutomationBot:
             logger.info("Starting News Automation Bot...")
             self.running = True
             
-            # Start WebSub server in background
-            websub_task = asyncio.create_task(self.websub_subscriber.start_server())
-            
-            # Start fallback polling in background - this is critical for bulletproof operation
-            polling_task = asyncio.create_task(self.websub_subscriber.fallback_feed_polling())
+            # Every task lives in one group, so a failure cancels its siblings
+            # and nothing is left running once the group exits
+            async with asyncio.TaskGroup() as tg:
+                # Start pipeline workers before any feed items can arrive
+                self._background_tasks = [
+                    tg.create_task(self._pipeline_worker())
+                    for _ in range(_PIPELINE_WORKERS)
+                ]
+                
+                self._background_tasks += [
+                    # WebSub server
+                    tg.create_task(self.websub_subscriber.start_server()),
+                    # Fallback polling - this is critical for bulletproof operation
+                    tg.create_task(self.websub_subscriber.fallback_feed_polling()),
+                    # Start RSS polling immediately (don't wait for WebSub failures)
+                    tg.create_task(self._run_initial_rss_poll()),
+                    # Timed housekeeping
+                    tg.create_task(self._maintenance_loop()),
+                    tg.create_task(self._daily_reset_loop())
+                ]
+                
+                tg.create_task(self._main_control_loop())
             
-            # Start RSS polling immediately (don't wait for WebSub failures)
-            initial_poll_task = asyncio.create_task(self._run_initial_rss_poll())
+            logger.info("News Automation Bot stopped")
             
-            # Main loop for engagement and maintenance
+        except Exception as e:
+            # Report each failed task rather than the TaskGroup wrapper
+            for error in (e.exceptions if isinstance(e, ExceptionGroup) else (e,)):
+                logger.error("Application run error: %s", error)
+            self.emergency_stop = True
+        finally:
+            await self._close_clients()
+    
+    async def _main_control_loop(self) -> None:
+        """Run engagement cycles until stopped, then stop the background tasks"""
+        try:
             while self.running and not self.emergency_stop:
                 try:
                     # Run engagement cycle every 5 minutes
                     await self.run_engagement_cycle()
                     await asyncio.sleep(300)  # 5 minutes
-                    
-                    # Run maintenance every hour
-                    if self.stats['items_processed'] % 12 == 0:  # Approximate hourly
-                        await self.run_maintenance_tasks()
                 
                 except KeyboardInterrupt:
                     logger.info("Received shutdown signal")
                     break
                 except Exception as e:
-                    logger.error(f"Main loop error: {e}")
+                    logger.error("Main loop error: %s", e)
                     await asyncio.sleep(60)  # Wait before retrying
-            
-            # Cleanup
-            websub_task.cancel()
-            polling_task.cancel()
-            initial_poll_task.cancel()
-            
-            if self.twitter_bot:
-                await self.twitter_bot.cleanup()
-            
-            logger.info("News Automation Bot stopped")
-            
-        except Exception as e:
-            logger.error(f"Application run error: {e}")
-            self.emergency_stop = True
+        finally:
+            for task in self._background_tasks:
+                task.cancel()
+    
+    async def _close_clients(self) -> None:
+        """Close every component's network clients"""
+        if self.twitter_bot:
+            await self.twitter_bot.cleanup()
+        await BROWSER_POOL.close()
+        
+        if self.ai_processor:
+            await self.ai_processor.close()
+        
+        if self.dedup_engine:
+            await self.dedup_engine.close()
+        
+        if self.websub_subscriber:
+            await self.websub_subscriber.close()
+        
+        if self.facebook_poster:
+            await self.facebook_poster.close()
+        
+        if self.telegram_poster:
+            await self.telegram_poster.close()
+        
+        if self._http_session is not None:
+            await self._http_session.close()
     
     async def _run_initial_rss_poll(self) -> None:
         """Run initial RSS poll to ensure system works immediately"""
@@ -390,18 +658,18 @@ class NewsAutomationBot:
                 logger.warning("RSS fallback method not available")
                 
         except Exception as e:
-            logger.error(f"Initial RSS poll error: {e}")
+            logger.error("Initial RSS poll error: %s", e)
     
-    def get_system_stats(self) -> Dict[str, Any]:
+    async def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
-        uptime = (datetime.now() - self.stats['start_time']).seconds if self.stats['start_time'] else 0
+        uptime = int(time.monotonic() - self._start_monotonic) if self._start_monotonic is not None else 0
         
         return {
             'uptime_seconds': uptime,
             'processing_stats': self.stats.copy(),
             'websub_stats': self.websub_subscriber.get_subscription_status() if self.websub_subscriber else {},
             'ai_stats': self.ai_processor.get_ai_status() if self.ai_processor else {},
-            'dedup_stats': self.dedup_engine.get_stats() if self.dedup_engine else {},
+            'dedup_stats': await self.dedup_engine.get_stats() if self.dedup_engine else {},
             'twitter_stats': self.twitter_bot.get_stats() if self.twitter_bot else {},
             'config_status': {
                 'emergency_stop': self.config_manager.is_emergency_stopped() if self.config_manager else False,
@@ -434,13 +702,14 @@ async def main():
         logger.info("Application interrupted by user")
         return 0
     except Exception as e:
-        logger.error(f"Application error: {e}")
+        logger.error("Application error: %s", e)
         return 1
 
 
 if __name__ == "__main__":
     try:
-        sys.exit(asyncio.run(main()))
+        # uvloop speeds up the webhook server and all outbound I/O when installed
+        sys.exit(uvloop.run(main()) if uvloop else asyncio.run(main()))
     except KeyboardInterrupt:
         print("\\nApplication interrupted")
         sys.exit(0)
\ No newline at end of file
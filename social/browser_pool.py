@@ -0,0 +1,127 @@
+"""
+Shared Browser Pool
+===================
+Keeps warm Playwright browser contexts per account for reuse across bot instances
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from playwright.async_api import async_playwright, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# Launches a context for an account on the pool's Playwright instance
+ContextLauncher = Callable[[object], Awaitable[BrowserContext]]
+ReleaseCallback = Callable[[], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class PooledContext:
+    """A browser context and the account it is logged in as"""
+    account_id: str
+    context: BrowserContext
+    in_use: bool = True
+    last_used: float = 0.0
+    owner: object = None
+
+
+class BrowserPool:
+    """Bounded pool of browser contexts, at most one per account"""
+    
+    def __init__(self, max_concurrent: int = 4):
+        self.max_concurrent = max_concurrent
+        self._playwright = None
+        self._pool: List[PooledContext] = []
+        self._changed = asyncio.Condition()
+    
+    async def acquire(self, account_id: str, launch: ContextLauncher,
+                      owner: object = None) -> Tuple[BrowserContext, ReleaseCallback]:
+        """Get a context for an account, reusing a warm one when available"""
+        async with self._changed:
+            while True:
+                pooled = self._find(account_id)
+                if pooled is not None and pooled.in_use and owner is not None and pooled.owner is owner:
+                    # Waiting would block on a release only the caller can make
+                    raise RuntimeError(f"Browser context for {account_id} is already held by this owner")
+                
+                if pooled is not None and not pooled.in_use:
+                    pooled.in_use = True
+                    pooled.owner = owner
+                    logger.debug(f"Reusing browser context for {account_id}")
+                    return pooled.context, self._release_callback(pooled)
+                
+                # One context per account: a profile directory can't be opened twice
+                if pooled is None:
+                    if len(self._pool) >= self.max_concurrent:
+                        await self._close_one_idle()
+                    
+                    if len(self._pool) < self.max_concurrent:
+                        if self._playwright is None:
+                            self._playwright = await async_playwright().start()
+                        
+                        pooled = PooledContext(account_id, await launch(self._playwright), owner=owner)
+                        self._pool.append(pooled)
+                        logger.info(f"Launched browser context for {account_id} ({len(self._pool)}/{self.max_concurrent})")
+                        return pooled.context, self._release_callback(pooled)
+                
+                await self._changed.wait()
+    
+    def _find(self, account_id: str) -> Optional[PooledContext]:
+        """Pooled context for an account, if any"""
+        for pooled in self._pool:
+            if pooled.account_id == account_id:
+                return pooled
+        return None
+    
+    def _release_callback(self, pooled: PooledContext) -> ReleaseCallback:
+        """Build the callback that returns a context to the pool"""
+        async def release() -> None:
+            async with self._changed:
+                if pooled.in_use:
+                    pooled.in_use = False
+                    pooled.owner = None
+                    pooled.last_used = time.monotonic()
+                    self._changed.notify_all()
+        return release
+    
+    async def _close_one_idle(self) -> None:
+        """Close the least recently used idle context to make room"""
+        idle = [pooled for pooled in self._pool if not pooled.in_use]
+        if idle:
+            await self._close(min(idle, key=lambda pooled: pooled.last_used))
+    
+    async def _close(self, pooled: PooledContext) -> None:
+        """Close a context and drop it from the pool"""
+        self._pool.remove(pooled)
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.error(f"Browser context close error: {e}")
+    
+    async def cleanup_idle(self, max_idle_time: float = 600) -> None:
+        """Close contexts that have been idle for longer than max_idle_time"""
+        async with self._changed:
+            cutoff = time.monotonic() - max_idle_time
+            for pooled in [pooled for pooled in self._pool if not pooled.in_use and pooled.last_used < cutoff]:
+                await self._close(pooled)
+                logger.info(f"Closed idle browser context for {pooled.account_id}")
+            self._changed.notify_all()
+    
+    async def close(self) -> None:
+        """Close every context and stop Playwright"""
+        async with self._changed:
+            for pooled in list(self._pool):
+                await self._close(pooled)
+            
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            self._changed.notify_all()
+
+
+# Shared by every TwitterBot in the process
+BROWSER_POOL = BrowserPool()
@@ -4,16 +4,33 @@ Facebook Page Posting Integration
 Posts content to Facebook pages using Graph API
 """
 
+import json
 import logging
 from typing import Dict, List, Optional, Any
 import aiohttp
-import aiofiles
+import aiofiles.os
 import os
 
 from core.config_manager import ConfigManager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Graph API error bodies are only logged, so read at most this much
+_ERROR_BODY_LIMIT = 4096
+
+# Graph API response decoder, faster with orjson when it is installed
+_loads = orjson.loads if orjson else json.loads
+
+
+async def _read_error_body(response: aiohttp.ClientResponse) -> str:
+    """Read a bounded prefix of an error response for logging"""
+    return (await response.content.read(_ERROR_BODY_LIMIT)).decode('utf-8', 'replace')
+
 
 class FacebookPoster:
     """Facebook page posting automation"""
@@ -26,6 +43,23 @@ class FacebookPoster:
         self.page_id = self.fb_config.get('page_id', '')
         self.base_url = "https://graph.facebook.com/v18.0"
         
+        # Pooled keep-alive session; each item makes up to three Graph API calls
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        
     async def post_content(self, content: str, image_path: Optional[str] = None) -> bool:
         """Post content to Facebook page"""
         try:
@@ -38,16 +72,16 @@ class FacebookPoster:
                 logger.warning("Daily post limit reached for Facebook")
                 return False
             
-            logger.info(f"Posting to Facebook: {content[:50]}...")
+            logger.info("Posting to Facebook: %.50s...", content)
             
             # Post with or without image
-            if image_path and os.path.exists(image_path):
+            if image_path and await aiofiles.os.path.exists(image_path):
                 return await self._post_with_image(content, image_path)
             else:
                 return await self._post_text_only(content)
                 
         except Exception as e:
-            logger.error(f"Facebook posting error: {e}")
+            logger.error("Facebook posting error: %s", e)
             return False
     
     async def _post_text_only(self, content: str) -> bool:
@@ -60,22 +94,22 @@ class FacebookPoster:
                 'access_token': self.access_token
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        post_id = result.get('id', '')
-                        
-                        self.config.record_platform_action('facebook', 'post')
-                        logger.info(f"Facebook post successful: {post_id}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Facebook API error: {response.status} - {error_text}")
-                        return False
-                        
+            session = self._get_session()
+            async with session.post(url, data=data) as response:
+                if response.status == 200:
+                    result = await response.json(loads=_loads)
+                    post_id = result.get('id', '')
+                    
+                    self.config.record_platform_action('facebook', 'post')
+                    logger.info("Facebook post successful: %s", post_id)
+                    return True
+                else:
+                    error_text = await _read_error_body(response)
+                    logger.error("Facebook API error: %s - %s", response.status, error_text)
+                    return False
+                    
         except Exception as e:
-            logger.error(f"Facebook text post error: {e}")
+            logger.error("Facebook text post error: %s", e)
             return False
     
     async def _post_with_image(self, content: str, image_path: str) -> bool:
@@ -96,22 +130,22 @@ class FacebookPoster:
                 'access_token': self.access_token
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        post_id = result.get('id', '')
-                        
-                        self.config.record_platform_action('facebook', 'post')
-                        logger.info(f"Facebook post with image successful: {post_id}")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Facebook API error: {response.status} - {error_text}")
-                        return False
-                        
+            session = self._get_session()
+            async with session.post(url, data=data) as response:
+                if response.status == 200:
+                    result = await response.json(loads=_loads)
+                    post_id = result.get('id', '')
+                    
+                    self.config.record_platform_action('facebook', 'post')
+                    logger.info("Facebook post with image successful: %s", post_id)
+                    return True
+                else:
+                    error_text = await _read_error_body(response)
+                    logger.error("Facebook API error: %s - %s", response.status, error_text)
+                    return False
+                    
         except Exception as e:
-            logger.error(f"Facebook image post error: {e}")
+            logger.error("Facebook image post error: %s", e)
             return False
     
     async def _upload_image(self, image_path: str) -> Optional[str]:
@@ -119,28 +153,27 @@ class FacebookPoster:
         try:
             url = f"{self.base_url}/{self.page_id}/photos"
             
-            async with aiofiles.open(image_path, 'rb') as f:
-                image_data = await f.read()
-            
-            data = aiohttp.FormData()
-            data.add_field('access_token', self.access_token)
-            data.add_field('published', 'false')  # Upload but don't publish
-            data.add_field('source', image_data, filename=os.path.basename(image_path))
-            
-            async with aiohttp.ClientSession() as session:
+            # aiohttp streams file payloads in chunks instead of holding the whole image
+            with open(image_path, 'rb') as image_file:
+                data = aiohttp.FormData()
+                data.add_field('access_token', self.access_token)
+                data.add_field('published', 'false')  # Upload but don't publish
+                data.add_field('source', image_file, filename=os.path.basename(image_path))
+                
+                session = self._get_session()
                 async with session.post(url, data=data) as response:
                     if response.status == 200:
-                        result = await response.json()
+                        result = await response.json(loads=_loads)
                         photo_id = result.get('id', '')
-                        logger.debug(f"Image uploaded to Facebook: {photo_id}")
+                        logger.debug("Image uploaded to Facebook: %s", photo_id)
                         return photo_id
                     else:
-                        error_text = await response.text()
-                        logger.error(f"Facebook image upload error: {response.status} - {error_text}")
+                        error_text = await _read_error_body(response)
+                        logger.error("Facebook image upload error: %s - %s", response.status, error_text)
                         return None
-                        
+                    
         except Exception as e:
-            logger.error(f"Image upload error: {e}")
+            logger.error("Image upload error: %s", e)
             return None
 
 
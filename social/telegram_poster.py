@@ -6,16 +6,20 @@ Posts content to Telegram channels using Bot API
 
 import logging
 from typing import Dict, List, Optional, Any
-import aiofiles
+import aiofiles.os
 import os
 
-from telegram import Bot
+from telegram import Bot, InputFile
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 
 from core.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections shared by all Bot API calls
+_CONNECTION_POOL_SIZE = 16
+
 
 class TelegramPoster:
     """Telegram channel posting automation"""
@@ -31,9 +35,23 @@ class TelegramPoster:
         self.bot = None
         if self.bot_token:
             try:
-                self.bot = Bot(token=self.bot_token)
+                request = HTTPXRequest(
+                    connection_pool_size=_CONNECTION_POOL_SIZE,
+                    http_version='1.1',
+                    connect_timeout=5,
+                    read_timeout=30
+                )
+                self.bot = Bot(token=self.bot_token, request=request)
+            except Exception as e:
+                logger.error("Telegram bot initialization error: %s", e)
+    
+    async def close(self):
+        """Close the bot's pooled HTTP connections"""
+        if self.bot is not None:
+            try:
+                await self.bot.shutdown()
             except Exception as e:
-                logger.error(f"Telegram bot initialization error: {e}")
+                logger.error("Telegram bot shutdown error: %s", e)
     
     async def post_content(self, content: str, image_path: Optional[str] = None) -> bool:
         """Post content to Telegram channel"""
@@ -47,16 +65,16 @@ class TelegramPoster:
                 logger.warning("Daily post limit reached for Telegram")
                 return False
             
-            logger.info(f"Posting to Telegram: {content[:50]}...")
+            logger.info("Posting to Telegram: %.50s...", content)
             
             # Post with or without image
-            if image_path and os.path.exists(image_path):
+            if image_path and await aiofiles.os.path.exists(image_path):
                 return await self._post_with_image(content, image_path)
             else:
                 return await self._post_text_only(content)
                 
         except Exception as e:
-            logger.error(f"Telegram posting error: {e}")
+            logger.error("Telegram posting error: %s", e)
             return False
     
     async def _post_text_only(self, content: str) -> bool:
@@ -71,41 +89,41 @@ class TelegramPoster:
             
             if message:
                 self.config.record_platform_action('telegram', 'post')
-                logger.info(f"Telegram message sent: {message.message_id}")
+                logger.info("Telegram message sent: %s", message.message_id)
                 return True
             
             return False
             
         except TelegramError as e:
-            logger.error(f"Telegram API error: {e}")
+            logger.error("Telegram API error: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Telegram text post error: {e}")
+            logger.error("Telegram text post error: %s", e)
             return False
     
     async def _post_with_image(self, content: str, image_path: str) -> bool:
         """Post content with image"""
         try:
-            async with aiofiles.open(image_path, 'rb') as photo_file:
+            with open(image_path, 'rb') as photo_file:
                 message = await self.bot.send_photo(
                     chat_id=self.channel_id,
-                    photo=photo_file,
+                    photo=InputFile(photo_file, filename=os.path.basename(image_path)),
                     caption=content,
                     parse_mode='HTML'
                 )
             
             if message:
                 self.config.record_platform_action('telegram', 'post')
-                logger.info(f"Telegram photo message sent: {message.message_id}")
+                logger.info("Telegram photo message sent: %s", message.message_id)
                 return True
             
             return False
             
         except TelegramError as e:
-            logger.error(f"Telegram API error: {e}")
+            logger.error("Telegram API error: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Telegram image post error: {e}")
+            logger.error("Telegram image post error: %s", e)
             return False
 
 
@@ -5,43 +5,207 @@ Ultra-realistic Twitter bot using Playwright for human-like engagement
 """
 
 import asyncio
+import hashlib
 import logging
 import random
+import math
+import os
 import time
+from array import array
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import json
 from urllib.parse import urljoin
 
-from playwright.async_api import async_playwright, Page, Browser
-from fake_useragent import UserAgent
+from playwright.async_api import Page, Browser, BrowserContext
 
 from core.config_manager import ConfigManager
 from core.ai_processor import AIProcessor
+from core.ttl_cache import TTLCache
+from social.browser_pool import BROWSER_POOL
 
 logger = logging.getLogger(__name__)
 
+# Desktop browser user agents, picked at random per browser launch
+_UA_POOL = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36 Edg/125.0.0.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:126.0) Gecko/20100101 Firefox/126.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:127.0) Gecko/20100101 Firefox/127.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14.5; rv:127.0) Gecko/20100101 Firefox/127.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0",
+)
+
+# Text and author of the first timeline tweets, read in one round-trip. Each
+# article is tagged with a scan-unique data-nsid so later steps can find the
+# same tweet after the virtualized timeline has shifted
+_EXTRACT_TWEETS_JS = """([limit, scan]) => Array.from(
+    document.querySelectorAll('article[data-testid="tweet"]')
+).slice(0, limit).map((tweet, index) => {
+    const text = tweet.querySelector('div[data-testid="tweetText"]');
+    const link = tweet.querySelector('div[data-testid="User-Name"] a');
+    const href = link ? link.getAttribute('href') || '' : '';
+    tweet.dataset.nsid = `${scan}-${index}`;
+    return {nsid: tweet.dataset.nsid, text: text ? text.innerText : '', author: href.split('/').pop()};
+})"""
+
+# Finds a tagged article, provided it still shows the text it was scanned
+# with (recycled cells can keep a stale tag)
+_FIND_TWEET_JS = """([nsid, expected]) => {
+    const tweet = document.querySelector(`article[data-nsid="${nsid}"]`);
+    const text = tweet && tweet.querySelector('div[data-testid="tweetText"]');
+    return tweet && (text ? text.innerText : '') === expected ? tweet : null;
+}"""
+
+# Clicks the like button of each listed tweet in one pass, matching tweets
+# like _FIND_TWEET_JS; returns the nsids that had one (already-liked tweets
+# show "unlike" instead)
+_CLICK_LIKES_JS = """(targets) => targets.filter(([nsid, expected]) => {
+    const tweet = document.querySelector(`article[data-nsid="${nsid}"]`);
+    const text = tweet && tweet.querySelector('div[data-testid="tweetText"]');
+    if (!tweet || (text ? text.innerText : '') !== expected) return false;
+    const button = tweet.querySelector('div[data-testid="like"]');
+    if (button) button.click();
+    return Boolean(button);
+}).map(([nsid]) => nsid)"""
+
+# Tweets already considered for engagement, by 64-bit content hash
+_PROCESSED_TWEETS_LIMIT = 5000
+_PROCESSED_TWEETS_TTL_SECONDS = 24 * 3600
+
+# Generated replies by normalized tweet text, so reposted text skips the AI
+_REPLY_CACHE_LIMIT = 512
+_REPLY_CACHE_TTL_SECONDS = 24 * 3600
+
+# Actions in PlatformLimits order; each daily cap refills over a day
+_ACTIONS = ('post', 'like', 'retweet', 'reply')
+_POSTS, _LIKES, _RETWEETS, _REPLIES = range(4)
+_STAT_NAMES = ('posts', 'likes', 'retweets', 'replies')
+_REFILL_SECONDS = 24 * 3600
+
+# Twitter enforces limits per 15 minutes; each engagement window admits a
+# few times its pro-rata share of the daily cap, so the quota can't go in
+# one burst
+_WINDOW_SECONDS = 15 * 60
+_WINDOW_BURST = 4
+
+# Resource types the bot never needs; text scraping and composer clicks
+# only rely on documents, scripts, stylesheets and API calls
+_BLOCKED_RESOURCE_TYPES = frozenset({'font', 'image', 'media', 'texttrack'})
+
+
+async def _block_heavy_resources(route) -> None:
+    """Abort requests for blocked resource types, pass everything else through"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Browser profile kept between runs so the login session survives restarts
+_DEFAULT_USER_DATA_DIR = 'twitter_profile'
+
+# Processed tweet IDs saved in the profile so a restart doesn't re-engage
+_PROCESSED_TWEETS_FILE = 'processed_tweets.json'
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate"""
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+    
+    def __init__(self, capacity: float, rate: float, tokens: Optional[float] = None):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity if tokens is None else tokens
+        self.updated = time.monotonic()
+    
+    def peek(self) -> float:
+        """Tokens available now, after refilling"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+    
+    def take(self, cost: float = 1.0) -> bool:
+        """Spend tokens if enough have accumulated"""
+        if self.peek() >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+# Inserts text at the caret of the focused element; execCommand fires the
+# input events the tweet composer listens to
+_INSERT_TEXT_JS = """([selector, text]) => {
+    const element = document.querySelector(selector);
+    element.focus();
+    document.execCommand('insertText', false, text);
+}"""
+
+# Scrolls the page in steps of varied distance with pauses between them, all
+# in the page so the sequence costs a single round-trip
+_HUMAN_SCROLL_JS = """async ({steps, base, pauseProbability, pauseRange, stepRange}) => {
+    const uniform = ([low, high]) => low + Math.random() * (high - low);
+    for (let i = 0; i < steps; i++) {
+        window.scrollBy(0, base + Math.round(uniform([-100, 100])));
+        const pause = Math.random() < pauseProbability ? pauseRange : stepRange;
+        await new Promise((resolve) => setTimeout(resolve, uniform(pause)));
+    }
+}"""
+
+
+class SlidingWindow:
+    """Admits at most `limit` events in any `window`-second span"""
+    __slots__ = ('limit', 'window', 'events')
+    
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.events = deque()
+    
+    def room(self, now: float) -> int:
+        """Drop events outside the window and count the free slots"""
+        events = self.events
+        while events and now - events[0] >= self.window:
+            events.popleft()
+        return self.limit - len(events)
+    
+    def has_room(self, now: float) -> bool:
+        """Whether an event would be admitted now"""
+        return self.room(now) > 0
+    
+    def record(self, now: float) -> None:
+        """Record an admitted event"""
+        self.events.append(now)
+
 
 class HumanBehaviorSimulator:
     """Simulates human-like behavior patterns for Twitter interaction"""
     
     def __init__(self, behavior_config: Dict[str, Any]):
         self.config = behavior_config
-        self.user_agent = UserAgent()
+        
+        # Delay ranges resolved once rather than on every action
+        delays = behavior_config.get('human_delays', {})
+        self._typing_range = (delays.get('min_typing_delay', 0.1), delays.get('max_typing_delay', 0.4))
+        self._scroll_range = (delays.get('min_scroll_delay', 2.0), delays.get('max_scroll_delay', 8.0))
+        self._action_range = (delays.get('min_action_delay', 3.0), delays.get('max_action_delay', 12.0))
         
     async def human_delay(self, action_type: str = "general") -> None:
         """Add human-like delay between actions"""
-        delays = self.config.get('human_delays', {})
-        
         if action_type == "typing":
-            min_delay = delays.get('min_typing_delay', 0.1)
-            max_delay = delays.get('max_typing_delay', 0.4)
+            min_delay, max_delay = self._typing_range
         elif action_type == "scrolling":
-            min_delay = delays.get('min_scroll_delay', 2.0)
-            max_delay = delays.get('max_scroll_delay', 8.0)
+            min_delay, max_delay = self._scroll_range
         else:
-            min_delay = delays.get('min_action_delay', 3.0)
-            max_delay = delays.get('max_action_delay', 12.0)
+            min_delay, max_delay = self._action_range
         
         delay = random.uniform(min_delay, max_delay)
         await asyncio.sleep(delay)
@@ -56,19 +220,16 @@ class HumanBehaviorSimulator:
             scroll_distance = scroll_config.get('scroll_distance', 500)
             pause_probability = scroll_config.get('pause_probability', 0.3)
             
-            # Scroll down with variations
-            for _ in range(random.randint(2, 5)):
-                # Add some randomness to scroll distance
-                distance = scroll_distance + random.randint(-100, 100)
-                
-                await page.evaluate(f"window.scrollBy(0, {distance})")
-                
-                # Random pause while scrolling
-                if random.random() < pause_probability:
-                    await self.human_delay("scrolling")
-                else:
-                    await asyncio.sleep(random.uniform(0.5, 2.0))
-                    
+            # Scroll down with variations and random pauses, in milliseconds
+            min_delay, max_delay = self._scroll_range
+            await page.evaluate(_HUMAN_SCROLL_JS, {
+                'steps': random.randint(2, 5),
+                'base': scroll_distance,
+                'pauseProbability': pause_probability,
+                'pauseRange': [min_delay * 1000, max_delay * 1000],
+                'stepRange': [500, 2000]
+            })
+            
         except Exception as e:
             logger.error(f"Human scroll error: {e}")
     
@@ -81,14 +242,18 @@ class HumanBehaviorSimulator:
             # Clear existing text
             await element.fill("")
             
-            # Type with human-like delays
-            for char in text:
-                await element.type(char)
-                if char == ' ':
-                    await self.human_delay("typing")
-                else:
-                    # Vary typing speed
-                    await asyncio.sleep(random.uniform(0.05, 0.15))
+            # Insert a few words per round-trip, pausing between chunks
+            words = text.split(' ')
+            index = 0
+            while index < len(words):
+                count = random.randint(3, 6)
+                chunk = ' '.join(words[index:index + count])
+                index += count
+                if index < len(words):
+                    chunk += ' '
+                
+                await page.evaluate(_INSERT_TEXT_JS, [selector, chunk])
+                await self.human_delay("typing")
             
             # Random pause after typing
             await self.human_delay("general")
@@ -99,7 +264,7 @@ class HumanBehaviorSimulator:
     
     def get_random_user_agent(self) -> str:
         """Get random user agent string"""
-        return self.user_agent.random
+        return random.choice(_UA_POOL)
 
 
 class TwitterBot:
@@ -110,10 +275,7 @@ class TwitterBot:
         self.ai_processor = ai_processor
         
         # Twitter configuration
-        self.twitter_config = config_manager.get_twitter_config()
-        self.account_config = self.twitter_config.get('account', {})
-        self.engagement_config = self.twitter_config.get('engagement', {})
-        self.limits_config = self.twitter_config.get('limits', {})
+        self.refresh_engagement_config()
         
         # Behavior simulator
         behavior_config = config_manager.get_human_behavior_config()
@@ -121,27 +283,102 @@ class TwitterBot:
         
         # Browser and page references
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self.playwright = None
+        self._release_context = None
+        
+        # Pipeline workers and the engagement loop share one page, so login,
+        # posts and engagement take turns driving it
+        self._page_lock = asyncio.Lock()
         
         # State tracking
         self.logged_in = False
         self.last_refresh = None
+        self._scan_serial = 0
         self.session_start = None
         
-        # Engagement tracking
-        self.daily_actions = {
-            'posts': 0,
-            'likes': 0,
-            'retweets': 0,
-            'replies': 0
+        # Engagement tracking, packed int64 counters indexed like _ACTIONS
+        self._action_counts = array('q', [0, 0, 0, 0])
+        
+        # Per-action rate limits, checked locally on every action
+        self._buckets = self._build_action_buckets()
+        self._windows = {
+            action: SlidingWindow(
+                max(1, math.ceil(bucket.capacity * _WINDOW_SECONDS / _REFILL_SECONDS * _WINDOW_BURST)),
+                _WINDOW_SECONDS
+            )
+            for action, bucket in self._buckets.items()
+            if action != 'post'  # A refused post drops the news item
+        }
+        
+        # Cache for processed tweets, valued by the wall-clock time last seen
+        self._processed_tweets_loaded = False
+        self.processed_tweets = TTLCache(maxsize=_PROCESSED_TWEETS_LIMIT, ttl=_PROCESSED_TWEETS_TTL_SECONDS)
+        self._reply_cache = TTLCache(maxsize=_REPLY_CACHE_LIMIT, ttl=_REPLY_CACHE_TTL_SECONDS)
+        
+    def refresh_engagement_config(self) -> None:
+        """Load Twitter config and precompute engagement targets and settings"""
+        self.twitter_config = self.config.get_twitter_config()
+        self.account_config = self.twitter_config.get('account', {})
+        self.engagement_config = self.twitter_config.get('engagement', {})
+        self.limits_config = self.twitter_config.get('limits', {})
+        
+        self._target_users_lc = frozenset(
+            user.lower() for user in self.engagement_config.get('target_usernames', [])
+        )
+        self._keywords_lc = tuple(kw.lower() for kw in self.engagement_config.get('keywords_to_like', []))
+        self._refresh_interval = self.config.get_human_behavior_config().get('refresh_interval', 300)  # 5 minutes
+    
+    def _build_action_buckets(self) -> Dict[str, TokenBucket]:
+        """Token buckets sized by the daily caps, seeded with today's remaining quota"""
+        limits = self.config.get_platform_limits('twitter')
+        if limits is None:
+            return {}
+        
+        return {
+            action: TokenBucket(cap, cap / _REFILL_SECONDS, tokens=max(0, cap - count))
+            for action, cap, count in zip(_ACTIONS, limits.caps, limits.counts)
         }
+    
+    def _take(self, action: str) -> bool:
+        """Whether an action is allowed now, spending one token if so"""
+        bucket = self._buckets.get(action)
+        if bucket is None or self.config.is_emergency_stopped():
+            return False
         
-        # Cache for processed tweets
-        self.processed_tweets = set()
+        window = self._windows.get(action)
+        if window is None:
+            return bucket.take()
         
+        # Check the window first so a refused action keeps its token
+        now = time.monotonic()
+        if not window.has_room(now) or not bucket.take():
+            return False
+        window.record(now)
+        return True
+    
+    def _available(self, action: str) -> int:
+        """How many of an action are allowed now, without spending any"""
+        bucket = self._buckets.get(action)
+        if bucket is None or self.config.is_emergency_stopped():
+            return 0
+        
+        available = int(bucket.peek())
+        window = self._windows.get(action)
+        if window is not None:
+            available = min(available, window.room(time.monotonic()))
+        return max(0, available)
+    
     async def initialize(self) -> bool:
         """Initialize browser and login to Twitter"""
+        async with self._page_lock:
+            # Another caller may have logged in while this one waited
+            if self.logged_in:
+                return True
+            return await self._initialize()
+    
+    async def _initialize(self) -> bool:
+        """Borrow a browser context and log in"""
         try:
             logger.info("Initializing Twitter bot...")
             
@@ -153,38 +390,17 @@ class TwitterBot:
                 logger.warning("Twitter credentials not configured - Twitter bot disabled")
                 return False
             
-            # Launch Playwright
-            self.playwright = await async_playwright().start()
-            
-            # Launch browser with human-like settings (headless in production)
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,  # Headless for server environments
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--no-first-run',
-                    '--no-default-browser-check',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
+            self._load_processed_tweets()
             
-            # Create context with human-like settings
-            context = await self.browser.new_context(
-                user_agent=self.behavior.get_random_user_agent(),
-                viewport={'width': 1366, 'height': 768}
+            # Borrow this account's warm browser context from the shared pool
+            self.context, self._release_context = await BROWSER_POOL.acquire(
+                username, self._launch_context, owner=self
             )
+            self.browser = self.context.browser
             
-            # Add stealth settings
-            await context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            """)
-            
-            # Create page
-            self.page = await context.new_page()
+            # Persistent contexts open with a blank page already
+            self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+            self._build_locators()
             
             # Login to Twitter
             await self._login()
@@ -198,17 +414,70 @@ class TwitterBot:
             await self.cleanup()
             return False
     
+    def _build_locators(self) -> None:
+        """Create locators for the page's composer and dialog controls"""
+        # .first keeps wait_for_selector's first-match behaviour, since
+        # locators refuse to act on ambiguous matches
+        page = self.page
+        self._tweet_button = page.locator('div[data-testid="tweetButtonInline"]').first
+        self._compose_link = page.locator('a[href="/compose/tweet"]').first
+        self._reply_button = page.locator('div[data-testid="reply"]').first
+        self._retweet_confirm = page.locator('div[data-testid="retweetConfirm"]').first
+        self._attachments_button = page.locator('div[data-testid="attachments"]').first
+        self._file_input = page.locator('input[type="file"]').first
+    
+    async def _launch_context(self, playwright) -> BrowserContext:
+        """Launch a browser context for this account on the pool's Playwright"""
+        # Launch browser on a persistent profile (headless in production),
+        # so saved session cookies skip the login flow
+        context = await playwright.chromium.launch_persistent_context(
+            user_data_dir=self.account_config.get('user_data_dir', _DEFAULT_USER_DATA_DIR),
+            headless=True,  # Headless for server environments
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-web-security',
+                '--disable-features=VizDisplayCompositor',
+                '--no-first-run',
+                '--no-default-browser-check',
+                '--disable-dev-shm-usage',
+                '--no-sandbox'
+            ],
+            user_agent=self.behavior.get_random_user_agent(),
+            viewport={'width': 1366, 'height': 768}
+        )
+        
+        # Add stealth settings
+        await context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+        """)
+        
+        # Skip downloading media for every page in this context
+        await context.route("**/*", _block_heavy_resources)
+        return context
+    
     async def _login(self) -> None:
         """Login to Twitter with human-like behavior"""
         try:
+            # A saved session lands on the home timeline instead of the login page
+            await self.page.goto("https://twitter.com/home", wait_until="domcontentloaded")
+            # Settle on either the composer or the login form the app redirects to
+            await self._tweet_button.or_(self.page.locator('input[name="text"]')).first.wait_for(timeout=15000)
+            if "/home" in self.page.url and await self._tweet_button.is_visible():
+                self.logged_in = True
+                logger.info("Reusing saved Twitter session")
+                return
+            
             logger.info("Logging in to Twitter...")
             
             # Navigate to Twitter login
-            await self.page.goto("https://twitter.com/login", wait_until="networkidle")
+            await self.page.goto("https://twitter.com/login", wait_until="domcontentloaded")
+            username_selector = 'input[name="text"]'
+            await self.page.locator(username_selector).wait_for(state="visible", timeout=15000)
             await self.behavior.human_delay()
             
             # Enter username
-            username_selector = 'input[name="text"]'
             await self.behavior.human_type(self.page, username_selector, self.account_config.get('username', ''))
             
             # Click Next
@@ -247,12 +516,17 @@ class TwitterBot:
     
     async def post_tweet(self, content: str, image_path: Optional[str] = None, is_thread: bool = False) -> bool:
         """Post a tweet with human-like behavior"""
+        async with self._page_lock:
+            return await self._post_tweet(content, image_path, is_thread)
+    
+    async def _post_tweet(self, content: str, image_path: Optional[str] = None, is_thread: bool = False) -> bool:
+        """Post a tweet; the caller holds the page lock"""
         try:
             if not self.logged_in:
                 raise Exception("Not logged in to Twitter")
             
-            # Check daily limits
-            if not self.config.can_post_to_platform('twitter'):
+            # Check daily limits; the token is only spent once the post goes out
+            if not self._available('post'):
                 logger.warning("Daily post limit reached for Twitter")
                 return False
             
@@ -261,15 +535,12 @@ class TwitterBot:
             # Navigate to home if not there
             await self._ensure_on_home()
             
-            # Click compose tweet
-            compose_selector = 'div[data-testid="tweetButtonInline"]'
+            # Click compose tweet (locator clicks wait for the element themselves)
             try:
-                compose_button = await self.page.wait_for_selector(compose_selector, timeout=5000)
+                await self._tweet_button.click(timeout=5000)
             except:
                 # Alternative selector
-                compose_button = await self.page.wait_for_selector('a[href="/compose/tweet"]')
-            
-            await compose_button.click()
+                await self._compose_link.click()
             await self.behavior.human_delay()
             
             # Type tweet content
@@ -281,16 +552,16 @@ class TwitterBot:
                 await self._add_image_to_tweet(image_path)
             
             # Post the tweet
-            tweet_button = await self.page.wait_for_selector('div[data-testid="tweetButtonInline"]')
-            await tweet_button.click()
+            await self._tweet_button.click()
+            
+            # Record action as soon as it has happened
+            self._take('post')
+            self.config.record_platform_action('twitter', 'post')
+            self._action_counts[_POSTS] += 1
             
             # Wait for tweet to be posted
             await self.behavior.human_delay("general")
             
-            # Record action
-            self.config.record_platform_action('twitter', 'post')
-            self.daily_actions['posts'] += 1
-            
             logger.info("Tweet posted successfully")
             return True
             
@@ -300,6 +571,11 @@ class TwitterBot:
     
     async def post_thread(self, thread_content: List[str], images: Optional[List[str]] = None) -> bool:
         """Post a Twitter thread"""
+        async with self._page_lock:
+            return await self._post_thread(thread_content, images)
+    
+    async def _post_thread(self, thread_content: List[str], images: Optional[List[str]] = None) -> bool:
+        """Post a Twitter thread; the caller holds the page lock"""
         try:
             if not thread_content:
                 return False
@@ -308,7 +584,7 @@ class TwitterBot:
             
             # Post first tweet
             first_image = images[0] if images else None
-            if not await self.post_tweet(f"{thread_content[0]} (1/{len(thread_content)})", first_image):
+            if not await self._post_tweet(f"{thread_content[0]} (1/{len(thread_content)})", first_image):
                 return False
             
             # Add replies for remaining tweets
@@ -316,8 +592,7 @@ class TwitterBot:
                 await self.behavior.human_delay("general")
                 
                 # Click reply to continue thread
-                reply_button = await self.page.wait_for_selector('div[data-testid="reply"]')
-                await reply_button.click()
+                await self._reply_button.click()
                 await self.behavior.human_delay()
                 
                 # Type reply content
@@ -330,8 +605,7 @@ class TwitterBot:
                     await self._add_image_to_tweet(images[i-1])
                 
                 # Post reply
-                reply_tweet_button = await self.page.wait_for_selector('div[data-testid="tweetButtonInline"]')
-                await reply_tweet_button.click()
+                await self._tweet_button.click()
                 
                 await self.behavior.human_delay("general")
             
@@ -344,135 +618,187 @@ class TwitterBot:
     
     async def engage_with_content(self) -> None:
         """Engage with content based on keywords and target users"""
+        async with self._page_lock:
+            await self._engage_with_content()
+    
+    async def _engage_with_content(self) -> None:
+        """Run one engagement pass; the caller holds the page lock"""
         try:
             logger.info("Starting content engagement...")
             
+            # A reload or keyword update swaps the cached config section
+            if self.config.get_twitter_config() is not self.twitter_config:
+                self.refresh_engagement_config()
+            
             # Navigate to home timeline
             await self._ensure_on_home()
             
             # Scroll through timeline
             await self.behavior.human_scroll(self.page)
             
-            # Find tweets to engage with
-            tweets = await self.page.query_selector_all('article[data-testid="tweet"]')
-            
-            for tweet in tweets[:10]:  # Limit to first 10 tweets
-                try:
-                    await self._process_tweet_for_engagement(tweet)
-                    await self.behavior.human_delay("general")
-                except Exception as e:
-                    logger.error(f"Tweet processing error: {e}")
-                    continue
+            # Read the first 10 tweets at once and filter them locally
+            self._scan_serial += 1
+            raw_tweets = await self.page.evaluate(_EXTRACT_TWEETS_JS, [10, self._scan_serial])
+            
+            # Filter on columns; tweet data dicts are only built for survivors
+            texts = [raw_tweet.get('text') or "" for raw_tweet in raw_tweets]
+            authors = [raw_tweet.get('author') or "" for raw_tweet in raw_tweets]
+            ids = [self._tweet_id(author, text) for author, text in zip(authors, texts)]
+            texts_lc = [text.lower() for text in texts]
+            authors_lc = [author.lower() for author in authors]
+            
+            selected = []
+            for index, (tweet_id, text_lc, author_lc) in enumerate(zip(ids, texts_lc, authors_lc)):
+                engagement_type = self._select_engagement(tweet_id, text_lc, author_lc)
+                if engagement_type is not None:
+                    tweet_data = {
+                        'id': tweet_id, 'nsid': raw_tweets[index]['nsid'],
+                        'text': texts[index], 'author': authors[index]
+                    }
+                    selected.append((tweet_data, engagement_type))
+            
+            if selected:
+                await self._engage_with_tweets(selected)
             
             # Refresh timeline occasionally
             if self._should_refresh_timeline():
-                await self.page.reload(wait_until="networkidle")
+                await self.page.reload(wait_until="domcontentloaded")
                 self.last_refresh = datetime.now()
             
         except Exception as e:
             logger.error(f"Content engagement error: {e}")
     
-    async def _process_tweet_for_engagement(self, tweet_element) -> None:
-        """Process individual tweet for potential engagement"""
+    def _select_engagement(self, tweet_id: int, tweet_text_lc: str, author_lc: str) -> Optional[str]:
+        """Pick the engagement type for a new tweet, or None to skip it"""
+        if tweet_id in self.processed_tweets:
+            # Still on the timeline, so keep it from aging out
+            self.processed_tweets[tweet_id] = time.time()
+            return None
+        self.processed_tweets[tweet_id] = time.time()
+        
+        # Check if this tweet should be engaged with
+        if not self._should_engage_with_tweet(tweet_text_lc, author_lc):
+            return None
+        return self._determine_engagement_type(author_lc)
+    
+    def _should_engage_with_tweet(self, tweet_text_lc: str, author_lc: str) -> bool:
+        """Determine if tweet should be engaged with (arguments already lowercased)"""
+        return author_lc in self._target_users_lc or any(
+            keyword in tweet_text_lc for keyword in self._keywords_lc
+        )
+    
+    def _determine_engagement_type(self, author_lc: str) -> str:
+        """Determine type of engagement based on author (already lowercased)"""
+        if author_lc in self._target_users_lc:
+            return "full_engagement"  # Like, retweet, and reply
+        else:
+            return "like_only"  # Just like
+    
+    async def _engage_with_tweets(self, selected: List[Tuple[Dict[str, Any], str]]) -> None:
+        """Like the selected tweets in one batch, then retweet and reply to target users"""
+        full_engagement = [
+            tweet_data for tweet_data, engagement_type in selected
+            if engagement_type == "full_engagement"
+        ]
+        
         try:
-            # Extract tweet data
-            tweet_data = await self._extract_tweet_data(tweet_element)
-            if not tweet_data:
-                return
+            # Start replies now so the AI calls overlap the likes, retweets
+            # and human delays that come first; quota is only spent on posting
+            for tweet_data in full_engagement[:self._available('reply')]:
+                tweet_data['reply_task'] = asyncio.create_task(self._generate_reply(tweet_data['text']))
+            
+            # Like as many selected tweets as the limits allow in one
+            # round-trip, spending quota only for the clicks that happened
+            like_targets = [
+                [tweet_data['nsid'], tweet_data['text']] for tweet_data, _ in selected[:self._available('like')]
+            ]
+            if like_targets:
+                liked = await self.page.evaluate(_CLICK_LIKES_JS, like_targets)
+                for _ in liked:
+                    self._take('like')
+                    self.config.record_platform_action('twitter', 'like')
+                    self._action_counts[_LIKES] += 1
+                await self.behavior.human_delay()
             
-            tweet_id = tweet_data.get('id', '')
-            if tweet_id in self.processed_tweets:
+            # Retweets open a confirm menu and replies a composer, so those go
+            # one tweet at a time
+            if not full_engagement:
                 return
             
-            tweet_text = tweet_data.get('text', '').lower()
-            author = tweet_data.get('author', '').lower()
-            
-            # Check if this tweet should be engaged with
-            should_engage = self._should_engage_with_tweet(tweet_text, author)
-            
-            if should_engage:
-                engagement_type = self._determine_engagement_type(author)
-                await self._engage_with_tweet(tweet_element, tweet_data, engagement_type)
+            for tweet_data in full_engagement:
+                # Look the tweet up again: earlier clicks and delays let the timeline move
+                handle = await self.page.evaluate_handle(_FIND_TWEET_JS, [tweet_data['nsid'], tweet_data['text']])
+                tweet_element = handle.as_element()
+                if tweet_element is None:
+                    logger.debug("Skipping tweet that left the timeline")
+                    continue
                 
-            self.processed_tweets.add(tweet_id)
+                await self._engage_with_tweet(tweet_element, tweet_data)
+                await self.behavior.human_delay("general")
             
         except Exception as e:
-            logger.error(f"Tweet processing error: {e}")
-    
-    def _should_engage_with_tweet(self, tweet_text: str, author: str) -> bool:
-        """Determine if tweet should be engaged with"""
-        # Check target usernames
-        target_users = [user.lower() for user in self.engagement_config.get('target_usernames', [])]
-        if author in target_users:
-            return True
-        
-        # Check keywords
-        keywords = [kw.lower() for kw in self.engagement_config.get('keywords_to_like', [])]
-        if any(keyword in tweet_text for keyword in keywords):
-            return True
-        
-        return False
-    
-    def _determine_engagement_type(self, author: str) -> str:
-        """Determine type of engagement based on author"""
-        target_users = [user.lower() for user in self.engagement_config.get('target_usernames', [])]
-        
-        if author.lower() in target_users:
-            return "full_engagement"  # Like, retweet, and reply
-        else:
-            return "like_only"  # Just like
+            logger.error(f"Tweet engagement error: {e}")
+        finally:
+            # Drop replies for tweets that were never reached
+            for tweet_data in full_engagement:
+                reply_task = tweet_data.get('reply_task')
+                if reply_task is not None and not reply_task.done():
+                    reply_task.cancel()
     
-    async def _engage_with_tweet(self, tweet_element, tweet_data: Dict, engagement_type: str) -> None:
-        """Engage with a specific tweet"""
+    async def _engage_with_tweet(self, tweet_element, tweet_data: Dict) -> None:
+        """Retweet and reply to a target user's tweet"""
         try:
-            # Like the tweet
-            if self.config.can_engage_on_platform('twitter', 'like'):
-                like_button = await tweet_element.query_selector('div[data-testid="like"]')
-                if like_button:
-                    await like_button.click()
+            # Retweet
+            if self._available('retweet'):
+                retweet_button = await tweet_element.query_selector('div[data-testid="retweet"]')
+                if retweet_button:
+                    await retweet_button.click()
+                    await self.behavior.human_delay()
+                    
+                    # Confirm retweet; quota is spent only once it goes through
+                    await self._retweet_confirm.click(timeout=5000)
+                    self._take('retweet')
+                    self.config.record_platform_action('twitter', 'retweet')
+                    self._action_counts[_RETWEETS] += 1
+                    
                     await self.behavior.human_delay()
-                    self.config.record_platform_action('twitter', 'like')
-                    self.daily_actions['likes'] += 1
-            
-            if engagement_type == "full_engagement":
-                # Retweet
-                if self.config.can_engage_on_platform('twitter', 'retweet'):
-                    retweet_button = await tweet_element.query_selector('div[data-testid="retweet"]')
-                    if retweet_button:
-                        await retweet_button.click()
-                        await self.behavior.human_delay()
-                        
-                        # Confirm retweet
-                        confirm_button = await self.page.wait_for_selector('div[data-testid="retweetConfirm"]', timeout=5000)
-                        await confirm_button.click()
-                        await self.behavior.human_delay()
-                        
-                        self.config.record_platform_action('twitter', 'retweet')
-                        self.daily_actions['retweets'] += 1
-                
-                # Reply with AI-generated content
-                if self.config.can_engage_on_platform('twitter', 'reply'):
-                    await self._reply_to_tweet(tweet_element, tweet_data)
             
-            logger.debug(f"Engaged with tweet: {engagement_type}")
+            # Reply with AI-generated content
+            if 'reply_task' in tweet_data:
+                await self._reply_to_tweet(tweet_element, tweet_data)
+            
+            logger.debug("Engaged with tweet: full_engagement")
             
         except Exception as e:
             logger.error(f"Tweet engagement error: {e}")
     
+    async def _generate_reply(self, original_text: str) -> Optional[str]:
+        """Generate intelligent reply, reusing one made for the same text"""
+        try:
+            cache_key = hashlib.blake2b(original_text.strip().lower().encode('utf-8'), digest_size=16).digest()
+            reply_content = self._reply_cache.get(cache_key)
+            if reply_content is None:
+                reply_content = await self.ai_processor.generate_intelligent_reply(original_text)
+                if reply_content:
+                    self._reply_cache[cache_key] = reply_content
+            return reply_content
+        
+        except Exception as e:
+            logger.error(f"Reply generation error: {e}")
+            return None
+    
     async def _reply_to_tweet(self, tweet_element, tweet_data: Dict) -> None:
         """Reply to a tweet with AI-generated content"""
         try:
-            # Generate intelligent reply
-            original_text = tweet_data.get('text', '')
-            reply_content = await self.ai_processor.generate_intelligent_reply(original_text)
-            
+            # Generation was started by _engage_with_tweets
+            reply_content = await tweet_data['reply_task']
             if not reply_content:
                 logger.warning("Could not generate reply content")
                 return
             
             # Click reply button
             reply_button = await tweet_element.query_selector('div[data-testid="reply"]')
-            if reply_button:
+            if reply_button and self._available('reply'):
                 await reply_button.click()
                 await self.behavior.human_delay()
                 
@@ -480,60 +806,36 @@ class TwitterBot:
                 reply_input_selector = 'div[data-testid="tweetTextarea_0"]'
                 await self.behavior.human_type(self.page, reply_input_selector, reply_content)
                 
-                # Post reply
-                reply_post_button = await self.page.wait_for_selector('div[data-testid="tweetButtonInline"]')
-                await reply_post_button.click()
+                # Post reply; quota is spent only once it goes out
+                await self._tweet_button.click()
+                self._take('reply')
+                self.config.record_platform_action('twitter', 'reply')
+                self._action_counts[_REPLIES] += 1
                 
                 await self.behavior.human_delay()
                 
-                self.config.record_platform_action('twitter', 'reply')
-                self.daily_actions['replies'] += 1
-                
                 logger.debug(f"Replied to tweet: {reply_content[:50]}...")
         
         except Exception as e:
             logger.error(f"Reply error: {e}")
     
-    async def _extract_tweet_data(self, tweet_element) -> Optional[Dict[str, Any]]:
-        """Extract data from tweet element"""
-        try:
-            # Extract tweet text
-            text_element = await tweet_element.query_selector('div[data-testid="tweetText"]')
-            text = await text_element.inner_text() if text_element else ""
-            
-            # Extract author
-            author_element = await tweet_element.query_selector('div[data-testid="User-Name"] a')
-            author = ""
-            if author_element:
-                href = await author_element.get_attribute('href')
-                if href:
-                    author = href.split('/')[-1]
-            
-            # Extract tweet ID (simplified)
-            tweet_id = f"{author}_{hash(text)}"
-            
-            return {
-                'id': tweet_id,
-                'text': text,
-                'author': author,
-                'element': tweet_element
-            }
-            
-        except Exception as e:
-            logger.error(f"Tweet data extraction error: {e}")
-            return None
+    @staticmethod
+    def _tweet_id(author: str, text: str) -> int:
+        """Stable 64-bit ID from author and text (hash() varies per process)"""
+        return int.from_bytes(
+            hashlib.blake2b(f"{author}\x1f{text}".encode('utf-8'), digest_size=8).digest(), 'little'
+        )
     
     async def _add_image_to_tweet(self, image_path: str) -> None:
         """Add image to tweet"""
         try:
             # Click add media button
-            media_button = await self.page.wait_for_selector('div[data-testid="attachments"]')
-            await media_button.click()
+            await self._attachments_button.click()
             await self.behavior.human_delay()
             
-            # Upload image
-            file_input = await self.page.wait_for_selector('input[type="file"]')
-            await file_input.set_input_files(image_path)
+            # Upload image (file inputs are usually hidden; the locator doesn't
+            # need them visible)
+            await self._file_input.set_input_files(image_path)
             
             # Wait for upload to complete
             await self.behavior.human_delay("general")
@@ -544,8 +846,9 @@ class TwitterBot:
     async def _ensure_on_home(self) -> None:
         """Ensure we're on the home timeline"""
         current_url = self.page.url
-        if "twitter.com/home" not in current_url:
-            await self.page.goto("https://twitter.com/home", wait_until="networkidle")
+        if "/home" not in current_url:
+            await self.page.goto("https://twitter.com/home", wait_until="domcontentloaded")
+            await self._tweet_button.wait_for(state="visible", timeout=10000)
             await self.behavior.human_delay()
     
     def _should_refresh_timeline(self) -> bool:
@@ -553,30 +856,74 @@ class TwitterBot:
         if not self.last_refresh:
             return True
         
-        refresh_interval = self.config.get_human_behavior_config().get('refresh_interval', 300)  # 5 minutes
-        return (datetime.now() - self.last_refresh).seconds > refresh_interval
+        return (datetime.now() - self.last_refresh).seconds > self._refresh_interval
     
     async def cleanup(self) -> None:
         """Clean up browser resources"""
         try:
-            if self.page:
-                await self.page.close()
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
+            self._save_processed_tweets()
+            
+            # The context and its page stay open in the pool for the next bot
+            if self._release_context:
+                await self._release_context()
+                self._release_context = None
+            self.page = self.context = self.browser = None
                 
             logger.info("Twitter bot cleaned up successfully")
             
         except Exception as e:
             logger.error(f"Cleanup error: {e}")
     
+    def _processed_tweets_path(self) -> str:
+        """Processed tweet IDs file inside this account's browser profile"""
+        user_data_dir = self.account_config.get('user_data_dir', _DEFAULT_USER_DATA_DIR)
+        return os.path.join(user_data_dir, _PROCESSED_TWEETS_FILE)
+    
+    def _load_processed_tweets(self) -> None:
+        """Restore processed tweet IDs saved by an earlier run, with their remaining TTLs"""
+        # Only a bot that got this far has a profile to save into later
+        self._processed_tweets_loaded = True
+        path = self._processed_tweets_path()
+        try:
+            with open(path, 'rb') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable processed tweets file {path}: {e}")
+            return
+        
+        now = time.time()
+        self.processed_tweets.restore(
+            (tweet_id, seen_at, _PROCESSED_TWEETS_TTL_SECONDS - (now - seen_at))
+            for tweet_id, seen_at in saved
+        )
+        logger.info(f"Restored {len(self.processed_tweets)} processed tweet IDs")
+    
+    def _save_processed_tweets(self) -> None:
+        """Atomically save processed tweet IDs and when each was last seen"""
+        if not self._processed_tweets_loaded:
+            return
+        
+        path = self._processed_tweets_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.processed_tweets.items(), f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not save processed tweets to {path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get bot statistics"""
         return {
             'logged_in': self.logged_in,
             'session_duration': (datetime.now() - self.session_start).seconds if self.session_start else 0,
-            'daily_actions': self.daily_actions.copy(),
+            'daily_actions': dict(zip(_STAT_NAMES, self._action_counts)),
             'processed_tweets': len(self.processed_tweets)
         }
 